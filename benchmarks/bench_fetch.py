@@ -0,0 +1,96 @@
+# coding: utf-8
+"""
+Benchmark hors ligne de la couche de téléchargement d'export_tourplay.
+
+Sert benchmarks/fixtures avec un serveur local (tourplay_server.py, latence
+simulée) sous N URL distinctes, puis mesure :
+  * sequential : un requests.get par URL, sans session ni cache (ancien comportement) ;
+  * cold       : Fetcher.fetch_many, session partagée et threads, cache vide ;
+  * warm       : même appel, cache frais : aucune requête ne doit partir ;
+  * revalidate : cache expiré (TTL 0) : requêtes conditionnelles, réponses 304.
+
+Usage :
+    python benchmarks/bench_fetch.py [--urls 8] [--latency 0.2] [--output fetch.json]
+
+Code de sortie 1 si le cache n'évite pas les téléchargements attendus.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_tourplay as et  # noqa: E402
+from tourplay_server import FIXTURES_DIR, serve_fixtures  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=8, help="Nombre d'URL distinctes (défaut : 8).")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latence simulée par requête, en secondes.")
+    parser.add_argument("--workers", type=int, default=8, help="Threads de téléchargement (défaut : 8).")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : sortie standard).")
+    args = parser.parse_args(argv)
+
+    import requests
+
+    page = os.path.basename(sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))[0])
+    report = {"benchmark": "fetch", "python": platform.python_version(),
+              "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "urls": args.urls,
+              "latency": args.latency, "runs": {}}
+    failures = []
+    with serve_fixtures(latency=args.latency) as (base_url, server), tempfile.TemporaryDirectory() as cache_dir:
+        urls = [f"{base_url}/{page}?division={k}" for k in range(args.urls)]
+
+        def run(name, func):
+            hits_before, not_modified_before = server.hits, server.not_modified
+            t0 = time.perf_counter()
+            func()
+            report["runs"][name] = {"seconds": time.perf_counter() - t0,
+                                    "requests": server.hits - hits_before,
+                                    "not_modified": server.not_modified - not_modified_before}
+            print(f"{name:>10} : {report['runs'][name]['seconds']:.3f} s, "
+                  f"{report['runs'][name]['requests']} requête(s)", file=sys.stderr)
+
+        def sequential():
+            for url in urls:
+                requests.get(url, headers={"User-Agent": et.USER_AGENT}, timeout=et.HTTP_TIMEOUT).raise_for_status()
+
+        fetcher = et.Fetcher(et.HttpCache(cache_dir), workers=args.workers)
+
+        def fetch_all():
+            pages, errors = fetcher.fetch_many(urls)
+            if errors:
+                failures.extend(errors.values())
+
+        run("sequential", sequential)
+        run("cold", fetch_all)
+        run("warm", fetch_all)
+        fetcher.cache.ttl = 0
+        run("revalidate", fetch_all)
+
+    runs = report["runs"]
+    if runs["warm"]["requests"] != 0:
+        failures.append("le cache frais a laissé partir des requêtes")
+    if runs["revalidate"]["not_modified"] != args.urls:
+        failures.append("la revalidation n'a pas reçu de 304 pour chaque URL")
+    report["failures"] = failures
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for failure in failures:
+        print(f"Échec : {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# coding: utf-8
+"""
+Benchmarks de la génération de calendriers et des exports.
+
+Génération : pour chaque stratégie, nombre d'équipes (4 à 1024) et nombre de
+journées (11, n/2 et n - 1, bornés à n - 1), mesure le temps, le taux de
+succès et les tirages par journée (MatchupGenerator.attempts_per_day) sur
+plusieurs seeds.
+
+Exports : sur des ligues synthétiques, chronomètre chaque format
+(save_markdown_table, csv_to_pdf, csv_to_image) ainsi que l'export complet
+generate_per_day_and_per_coach_tables. Les formats dont la bibliothèque est
+absente sont marqués "skipped".
+
+Les résultats sont écrits en JSON pour comparer les exécutions entre elles.
+Aucune dépendance à Tk : tourne sur un serveur sans affichage.
+
+Usage :
+    python benchmarks/bench_generation.py [--teams 4,8,16] [--repeats 3] [--output bench.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Les avertissements de dépendances manquantes partent sur stderr, pas dans le JSON
+with contextlib.redirect_stdout(sys.stderr):
+    import matchup_generator as mg  # noqa: E402
+
+DEFAULT_TEAMS = [4, 8, 16, 32, 64, 128, 256, 512, 1024]
+DEFAULT_EXPORT_TEAMS = [8, 32, 128]
+ROSTERS = ["Humains", "Orques", "Nains", "Elfes Sylvains", "Skavens", "Morts-Vivants", "Hommes-Lézards", "Chaos"]
+
+
+def parse_int_list(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def day_counts(n_teams):
+    """Nombres de journées testés pour n_teams : 11, n/2 et n - 1, sans doublon."""
+    return sorted({min(11, n_teams - 1), max(1, n_teams // 2), n_teams - 1})
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    return {"min": min(samples), "median": statistics.median(samples), "max": max(samples)}
+
+
+def bench_generation_case(n_teams, n_days, strategy, repeats, base_seed):
+    """Génère repeats calendriers (seeds base_seed, base_seed + 1, ...) et agrège les mesures."""
+    times, successes, attempts, backtracks, days_built = [], 0, [], [], []
+    for k in range(repeats):
+        gen = mg.MatchupGenerator(n_teams, n_days, strategy=strategy, seed=base_seed + k)
+        t0 = time.perf_counter()
+        # Les messages d'échec du générateur ne doivent pas se mêler au JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            ok = gen.generate()
+        times.append(time.perf_counter() - t0)
+        successes += bool(ok)
+        days_built.append(len(gen.schedule))
+        attempts.extend(gen.attempts_per_day)
+        backtracks.append(gen.backtracks)
+    return {
+        "strategy": strategy,
+        "n_teams": n_teams,
+        "n_days": n_days,
+        "repeats": repeats,
+        "seconds": summarize(times),
+        "success_rate": successes / repeats,
+        "days_built": summarize(days_built),
+        "attempts_per_day": {
+            "mean": statistics.mean(attempts) if attempts else 0,
+            "max": max(attempts, default=0),
+            "retries": sum(a - 1 for a in attempts),
+        },
+        "backtracks": summarize(backtracks),
+    }
+
+
+def synthetic_league(n_teams, seed):
+    """Ligue fictive : coachs numérotés, rosters tournants, deux groupes."""
+    coachs_map = {
+        str(i): {"num": str(i), "coach": f"Coach {i:04d}", "team": f"Équipe {i:04d}",
+                 "roster": ROSTERS[i % len(ROSTERS)], "groupe": "AB"[i % 2]}
+        for i in range(1, n_teams + 1)}
+    gen = mg.MatchupGenerator(n_teams, min(11, n_teams - 1), seed=seed)
+    gen.generate()
+    return gen.to_schedule(coachs_map)
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - t0
+
+
+def bench_export_case(n_teams, repeats, seed, workers):
+    """Chronomètre chaque format d'export sur la journée 1 et l'export complet d'une ligue synthétique."""
+    schedule = synthetic_league(n_teams, seed)
+    index = schedule.index()
+    headers = index.headers
+    day_rows = [[row[h] for h in headers] for row in index.by_day[index.days[0]]]
+    result = {"n_teams": n_teams, "n_matches": len(schedule.matches), "formats": {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "journee.csv")
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write(";".join(headers) + "\n")
+            f.writelines(";".join(str(cell) for cell in row) + "\n" for row in day_rows)
+
+        cases = {
+            "markdown": (True, lambda k: mg.save_markdown_table(os.path.join(tmp, f"t{k}.md"), headers, day_rows)),
+            "pdf": (mg.REPORTLAB_INSTALLED, lambda k: mg.csv_to_pdf(csv_path, os.path.join(tmp, f"t{k}.pdf"))),
+            "png": (mg.MATPLOTLIB_INSTALLED, lambda k: mg.csv_to_image(csv_path, os.path.join(tmp, f"t{k}.png"))),
+        }
+        for name, (available, run) in cases.items():
+            if not available:
+                result["formats"][name] = "skipped"
+                continue
+            result["formats"][name] = summarize([timed(run, k) for k in range(repeats)])
+
+        full = []
+        for k in range(repeats):
+            outdir = os.path.join(tmp, f"full{k}")
+            full.append(timed(mg.generate_per_day_and_per_coach_tables, schedule, outdir,
+                              incremental=False, workers=workers, pdf_mode="both"))
+        result["full_export"] = summarize(full)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=parse_int_list, default=DEFAULT_TEAMS,
+                        help="Nombres d'équipes, séparés par des virgules (défaut : 4 à 1024).")
+    parser.add_argument("--strategies", default=",".join(mg.STRATEGIES),
+                        help="Stratégies testées (défaut : toutes).")
+    parser.add_argument("--repeats", type=int, default=3, help="Seeds par cas (défaut : 3).")
+    parser.add_argument("--seed", type=int, default=1, help="Premier seed (défaut : 1).")
+    parser.add_argument("--export-teams", type=parse_int_list, default=DEFAULT_EXPORT_TEAMS,
+                        help="Tailles des ligues synthétiques pour les exports.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processus de rendu pour l'export complet (défaut : 1).")
+    parser.add_argument("--skip-export", action="store_true", help="Ne mesure que la génération.")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : sortie standard).")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "generation",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "generation": [],
+        "export": [],
+    }
+    for strategy in args.strategies.split(","):
+        for n_teams in args.teams:
+            for n_days in day_counts(n_teams):
+                case = bench_generation_case(n_teams, n_days, strategy, args.repeats, args.seed)
+                report["generation"].append(case)
+                print(f"{strategy:>8} {n_teams:>5} équipes {n_days:>5} journées : "
+                      f"{case['seconds']['median']:.4f} s, succès {case['success_rate']:.0%}",
+                      file=sys.stderr)
+    if not args.skip_export:
+        for n_teams in args.export_teams:
+            with contextlib.redirect_stdout(sys.stderr):
+                report["export"].append(bench_export_case(n_teams, args.repeats, args.seed, args.workers))
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# coding: utf-8
+"""
+Benchmark du rendu JavaScript des pages Tourplay, contre un serveur local.
+
+  * static     : page dont les participants sont déjà dans le HTML brut
+                 (benchmarks/fixtures) : téléchargement seul, aucun navigateur ;
+  * fresh      : ancien comportement, un HTMLSession et un Chromium par page ;
+  * pool       : load_pages, téléchargement par le Fetcher puis RenderPool, un
+                 seul Chromium et les pages rendues en parallèle dans des
+                 onglets à partir du HTML téléchargé.
+
+fresh et pool utilisent benchmarks/fixtures/js/participants_js.html, dont la
+liste n'existe qu'après exécution du script. fresh nécessite requests_html,
+pool pyppeteer (et tous deux Chromium, téléchargé par pyppeteer au premier
+lancement) ; sans eux, ils sont marqués "skipped". Le cache HTTP est
+désactivé pendant les mesures.
+
+Usage :
+    python benchmarks/bench_render.py [--pages 4] [--tabs 4] [--output render.json]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_tourplay as et  # noqa: E402
+from tourplay_server import FIXTURES_DIR, serve_fixtures  # noqa: E402
+
+REQUESTS_HTML_AVAILABLE = importlib.util.find_spec("requests_html") is not None
+JS_FIXTURES_DIR = os.path.join(FIXTURES_DIR, "js")
+JS_PAGE = "participants_js.html"
+STATIC_PAGE = "participants_division.html"
+
+
+def timed(func):
+    t0 = time.perf_counter()
+    result = func()
+    return time.perf_counter() - t0, result
+
+
+def render_fresh_sessions(urls):
+    """Ancien load_html : une session et un navigateur neufs pour chaque page."""
+    from requests_html import HTMLSession
+    pages = []
+    for url in urls:
+        session = HTMLSession()
+        try:
+            resp = session.get(url, headers={"User-Agent": et.USER_AGENT}, timeout=et.HTTP_TIMEOUT)
+            resp.html.render(timeout=et.RENDER_TIMEOUT)
+            pages.append(resp.html.html)
+        finally:
+            session.close()
+    return pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=4, help="Pages rendues par mesure (défaut : 4).")
+    parser.add_argument("--tabs", type=int, default=et.RENDER_TABS, help="Onglets simultanés du pool.")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : sortie standard).")
+    args = parser.parse_args(argv)
+
+    et.configure_fetcher(use_cache=False)
+    report = {"benchmark": "render", "python": platform.python_version(),
+              "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "pages": args.pages, "tabs": args.tabs,
+              "requests_html": REQUESTS_HTML_AVAILABLE, "pyppeteer": et.PYPPETEER_AVAILABLE, "runs": {}}
+
+    with serve_fixtures(FIXTURES_DIR) as (static_base, _):
+        urls = [f"{static_base}/{STATIC_PAGE}?division={k}" for k in range(args.pages)]
+        seconds, (pages, errors) = timed(lambda: et.load_pages(urls))
+        report["runs"]["static"] = {
+            "seconds": seconds, "errors": errors,
+            "participants": [len(et.extract_tourplay_data(html)) for html in pages.values()],
+            "browser_started": et._RENDER_POOL is not None,
+        }
+
+    with serve_fixtures(JS_FIXTURES_DIR) as (js_base, _):
+        urls = [f"{js_base}/{JS_PAGE}?division={k}" for k in range(args.pages)]
+        if not REQUESTS_HTML_AVAILABLE:
+            report["runs"]["fresh"] = "skipped"
+        else:
+            seconds, pages = timed(lambda: render_fresh_sessions(urls))
+            report["runs"]["fresh"] = {
+                "seconds": seconds,
+                "participants": [len(et.extract_tourplay_data(html)) for html in pages]}
+
+        if not et.PYPPETEER_AVAILABLE:
+            report["runs"]["pool"] = "skipped"
+        else:
+            et._RENDER_POOL = pool = et.RenderPool(tabs=args.tabs)
+            try:
+                startup, _ = timed(lambda: et.load_pages(urls[:1]))
+                seconds, (pages, errors) = timed(lambda: et.load_pages(urls))
+            finally:
+                pool.close()
+                et._RENDER_POOL = None
+            report["runs"]["pool"] = {
+                "first_render_seconds": startup, "seconds": seconds, "errors": errors,
+                "participants": [len(et.extract_tourplay_data(html)) for html in pages.values()]}
+
+    for name, run in report["runs"].items():
+        summary = run if isinstance(run, str) else f"{run['seconds']:.3f} s"
+        print(f"{name:>7} : {summary}", file=sys.stderr)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
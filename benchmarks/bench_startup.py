@@ -0,0 +1,203 @@
+# coding: utf-8
+"""
+Benchmark du temps de démarrage des deux outils.
+
+Mesure, dans des processus Python neufs :
+  * le temps d'import de chaque module et les bibliothèques lourdes chargées
+    par cet import (elles doivent rester absentes, cf. imports différés) ;
+  * le temps jusqu'à la première fenêtre, pour les scripts et pour les
+    exécutables PyInstaller trouvés dans dist/<plateforme>/. Les applications
+    ne contiennent aucun code de mesure : un script est lancé par une sonde
+    qui programme, sur la fenêtre Tk créée, l'écriture d'une ligne puis la
+    fermeture ; un exécutable est surveillé de l'extérieur jusqu'à
+    l'apparition d'une fenêtre portant son titre (xdotool sous Linux,
+    FindWindowW sous Windows), puis arrêté.
+
+Usage :
+    python benchmarks/bench_startup.py [--runs 5] [--output startup.json]
+
+La mesure de fenêtre nécessite un affichage (DISPLAY sous Linux) ; sans
+affichage, ou sans moyen de détecter la fenêtre d'un exécutable, elle est
+marquée "skipped".
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["matchup_generator", "export_tourplay"]
+HEAVY_MODULES = ["tkinter", "reportlab", "matplotlib", "pandas", "requests", "bs4", "requests_html"]
+# Titre de la fenêtre principale de chaque outil, pour détecter celle d'un exécutable
+WINDOW_TITLES = {"matchup_generator": "Générateur de Matchups V3",
+                 "export_tourplay": "Extracteur Coachs Tourplay"}
+WINDOW_TIMEOUT = 120
+WINDOW_POLL_INTERVAL = 0.01
+
+IMPORT_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_loaded": heavy}}))
+"""
+
+# Lance un script comme __main__ ; la première fenêtre Tk signale son
+# affichage sur la sortie standard puis se ferme.
+WINDOW_PROBE = """
+import runpy, sys, tkinter
+tk_init = tkinter.Tk.__init__
+def probe_init(self, *args, **kwargs):
+    tk_init(self, *args, **kwargs)
+    def done():
+        print("first-window", flush=True)
+        self.destroy()
+    self.after_idle(done)
+tkinter.Tk.__init__ = probe_init
+sys.argv = [{script!r}]
+runpy.run_path({script!r}, run_name="__main__")
+"""
+
+
+def summarize(samples):
+    """Statistiques d'une série de mesures (secondes)."""
+    if not samples:
+        return None
+    return {
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def measure_import(module, runs):
+    """Temps d'import de module dans un interpréteur neuf, runs fois."""
+    samples, heavy = [], []
+    code = IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, capture_output=True,
+                             text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        heavy = result["heavy_loaded"]
+    return {"seconds": summarize(samples), "heavy_loaded": heavy}
+
+
+def measure_script_window(script, runs):
+    """Temps entre le lancement du script et l'affichage de sa première fenêtre."""
+    cmd = [sys.executable, "-c", WINDOW_PROBE.format(script=script)]
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=REPO_DIR, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
+        try:
+            for line in proc.stdout:
+                if line.strip() == "first-window":
+                    samples.append(time.perf_counter() - t0)
+                    break
+            proc.wait(timeout=WINDOW_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+    return summarize(samples)
+
+
+def window_detector():
+    """Fonction title -> bool (fenêtre visible ?) pour la plateforme, ou None."""
+    if sys.platform == "win32":
+        import ctypes
+        find_window = ctypes.windll.user32.FindWindowW
+        return lambda title: bool(find_window(None, title))
+    if sys.platform.startswith("linux") and shutil.which("xdotool"):
+        return lambda title: subprocess.run(
+            ["xdotool", "search", "--onlyvisible", "--name", f"^{title}$"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+    return None
+
+
+def measure_executable_window(path, title, runs, detect):
+    """Temps entre le lancement de l'exécutable et l'apparition d'une fenêtre titrée title."""
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([path], cwd=REPO_DIR, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
+        try:
+            while not detect(title):
+                if proc.poll() is not None or time.perf_counter() - t0 > WINDOW_TIMEOUT:
+                    raise subprocess.SubprocessError(f"aucune fenêtre '{title}'")
+                time.sleep(WINDOW_POLL_INTERVAL)
+            samples.append(time.perf_counter() - t0)
+        finally:
+            proc.kill()
+            proc.wait()
+    return summarize(samples)
+
+
+def find_executables():
+    """Exécutables construits par build.py pour la plateforme courante."""
+    plat = {"linux": "linux", "win32": "windows", "darwin": "macos"}.get(sys.platform, sys.platform)
+    dist = os.path.join(REPO_DIR, "dist", plat)
+    found = {}
+    for module in MODULES:
+        for name in (module, module + ".exe"):
+            path = os.path.join(dist, name)
+            if os.path.isfile(path):
+                found[module] = path
+    return found
+
+
+def has_display():
+    return not sys.platform.startswith("linux") or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de mesures par cible (défaut : 5).")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : sortie standard).")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "startup",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "import": {module: measure_import(module, args.runs) for module in MODULES},
+        "first_window": {},
+    }
+
+    detect = window_detector()
+    targets = [(f"{module}.py", module, None) for module in MODULES]
+    targets += [(os.path.relpath(path, REPO_DIR), module, path) for module, path in find_executables().items()]
+    for name, module, executable in targets:
+        if not has_display() or (executable and detect is None):
+            report["first_window"][name] = "skipped"
+            continue
+        try:
+            if executable:
+                result = measure_executable_window(executable, WINDOW_TITLES[module], args.runs, detect)
+            else:
+                result = measure_script_window(os.path.join(REPO_DIR, module + ".py"), args.runs)
+            report["first_window"][name] = result
+        except (OSError, subprocess.SubprocessError) as e:
+            report["first_window"][name] = f"error: {e}"
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# coding: utf-8
+"""
+Micro-benchmark et contrôle d'équivalence des moteurs d'extraction Tourplay.
+
+Pour chaque page de benchmarks/fixtures/*.html (ou celles passées en
+argument), vérifie que chaque moteur installé (selectolax, lxml, stream, bs4,
+html5lib) produit exactement la même liste de participants que le moteur de
+référence (bs4 si installé, sinon stream), puis mesure son temps d'analyse.
+
+--scale N construit en plus, pour chaque page, une version N fois plus grande
+en répétant ses blocs mat-list-item, pour mesurer les grosses ligues.
+
+Usage :
+    python benchmarks/bench_tourplay_parsers.py [--repeats 5] [--scale 100] [--output parsers.json]
+
+Code de sortie 1 si un moteur ne donne pas le même résultat que la référence.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import export_tourplay as et  # noqa: E402
+
+FIXTURES_DIR = os.path.join(REPO_DIR, "benchmarks", "fixtures")
+ITEM_RE = re.compile(r"<mat-list-item\b.*?</mat-list-item>", re.S)
+
+
+def scaled_page(html, factor):
+    """Page dont les blocs mat-list-item sont répétés factor fois."""
+    body = max(html.find("<body"), 0)
+    items = ITEM_RE.findall(html, body)
+    if not items:
+        return html
+    start = html.index(items[0], body)
+    end = html.rindex(items[-1]) + len(items[-1])
+    return html[:start] + "".join(items) * factor + html[end:]
+
+
+def bench_page(name, html, engines, reference, repeats):
+    expected = et.extract_tourplay_data(html, reference)
+    page = {"page": name, "bytes": len(html.encode("utf-8")), "participants": len(expected),
+            "reference": reference, "engines": {}}
+    mismatches = []
+    for engine in engines:
+        parse = et.EXTRACTION_ENGINES[engine][1]
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            results = et.finalize_results(parse(html))
+            samples.append(time.perf_counter() - t0)
+        equivalent = results == expected
+        if not equivalent:
+            mismatches.append(f"{name} : {engine}")
+        page["engines"][engine] = {
+            "equivalent": equivalent,
+            "seconds": {"min": min(samples), "median": statistics.median(samples)},
+        }
+    return page, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="Pages HTML (défaut : benchmarks/fixtures/*.html).")
+    parser.add_argument("--repeats", type=int, default=5, help="Mesures par moteur et par page (défaut : 5).")
+    parser.add_argument("--scale", type=int, default=0,
+                        help="Ajoute une version N fois plus grande de chaque page (défaut : aucune).")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : sortie standard).")
+    args = parser.parse_args(argv)
+
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    engines = et.available_engines()
+    reference = "bs4" if "bs4" in engines else "stream"
+    report = {
+        "benchmark": "tourplay_parsers",
+        "python": platform.python_version(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "engines": engines,
+        "auto": et.select_engine("auto"),
+        "pages": [],
+    }
+    mismatches = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        name = os.path.basename(path)
+        variants = [(name, html)]
+        if args.scale > 1:
+            variants.append((f"{name} x{args.scale}", scaled_page(html, args.scale)))
+        for variant_name, variant in variants:
+            page, errors = bench_page(variant_name, variant, engines, reference, args.repeats)
+            report["pages"].append(page)
+            mismatches.extend(errors)
+            timings = ", ".join(f"{engine} {data['seconds']['median'] * 1000:.1f} ms"
+                                for engine, data in page["engines"].items())
+            print(f"{variant_name} ({page['participants']} participants) : {timings}", file=sys.stderr)
+    report["mismatches"] = mismatches
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for mismatch in mismatches:
+        print(f"Résultat différent de la référence ({reference}) : {mismatch}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
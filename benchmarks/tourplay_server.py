@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+Serveur HTTP local servant des pages Tourplay enregistrées (benchmarks/fixtures),
+pour tester et mesurer le téléchargement sans réseau.
+
+Chaque réponse porte un ETag et un Last-Modified, et les requêtes
+conditionnelles (If-None-Match / If-Modified-Since) reçoivent un 304.
+latency simule le temps de réponse du vrai site. La chaîne de requête est
+ignorée : /page.html?d=1 et /page.html?d=2 servent le même fichier sous deux URL.
+"""
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+        time.sleep(server.latency)
+        path = os.path.join(server.directory, os.path.basename(self.path.split("?", 1)[0]))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        mtime = int(os.path.getmtime(path))
+        not_modified = self.headers.get("If-None-Match") == etag
+        since = self.headers.get("If-Modified-Since")
+        if since and not self.headers.get("If-None-Match"):
+            with contextlib.suppress(TypeError, ValueError):
+                not_modified = parsedate_to_datetime(since).timestamp() >= mtime
+        if not_modified:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_fixtures(directory=FIXTURES_DIR, latency=0.0):
+    """Démarre le serveur sur un port libre ; produit (url de base, serveur)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.daemon_threads = True
+    server.directory = directory
+    server.latency = latency
+    server.hits = 0
+    server.not_modified = 0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", server
+    finally:
+        server.shutdown()
+        server.server_close()
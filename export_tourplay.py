@@ -1,96 +1,630 @@
 import sys
+import os
 import json
 import csv
-import requests
-from bs4 import BeautifulSoup
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox, scrolledtext
-try:
-    from requests_html import HTMLSession
-    REQUESTS_HTML_AVAILABLE = True
-except ImportError:
-    REQUESTS_HTML_AVAILABLE = False
+import importlib.util
+import re
+import time
+import argparse
+import multiprocessing
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+# requests, pyppeteer, BeautifulSoup et tkinter sont importés dans les
+# fonctions qui s'en servent : le démarrage n'en paie pas le coût.
+PYPPETEER_AVAILABLE = importlib.util.find_spec("pyppeteer") is not None
 
-def load_html(source):
-    """Charge le HTML depuis un fichier local ou une URL (avec JS si possible)."""
-    if source.startswith('http://') or source.startswith('https://'):
-        headers = {
-            'User-Agent': (
-                'Mozilla/5.0 (Linux; Android 10; SM-G996U Build/QP1A.190711.020; wv) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Mobile Safari/537.36'
-            )
-        }
-        if REQUESTS_HTML_AVAILABLE:
-            session = HTMLSession()
-            resp = session.get(source, headers=headers, timeout=15)
+USER_AGENT = (
+    'Mozilla/5.0 (Linux; Android 10; SM-G996U Build/QP1A.190711.020; wv) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Mobile Safari/537.36'
+)
+HTTP_TIMEOUT = 15
+HTTP_CACHE_DIR = os.path.join("tourplay_data_exported", ".http_cache")
+HTTP_CACHE_TTL = 15 * 60            # une page plus récente est servie sans requête
+HTTP_CACHE_MAX_AGE = 7 * 24 * 3600  # au-delà, l'entrée est supprimée
+
+class HttpCache:
+    """
+    Cache disque des pages téléchargées, indexé par URL. Chaque entrée garde
+    le corps, l'ETag, le Last-Modified et l'heure du dernier téléchargement ou
+    de la dernière revalidation. Une entrée de moins de ttl secondes est servie
+    telle quelle ; plus ancienne, elle est revalidée par une requête
+    conditionnelle ; au-delà de max_age, evict() la supprime.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, max_age=HTTP_CACHE_MAX_AGE):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age
+
+    def _path(self, url):
+        import hashlib
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        """Entrée du cache pour url (dict), ou None."""
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def store(self, url, body, etag=None, last_modified=None):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"url": url, "body": body, "etag": etag, "last_modified": last_modified,
+                 "fetched_at": time.time()}
+        path = self._path(url)
+        # Écriture atomique : plusieurs threads ou processus peuvent lire le cache
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return entry
+
+    def touch(self, entry):
+        """Marque une entrée revalidée (réponse 304) comme fraîche."""
+        return self.store(entry["url"], entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    def evict(self):
+        """Supprime les entrées plus vieilles que max_age. Retourne le nombre d'entrées supprimées."""
+        removed = 0
+        now = time.time()
+        for path in glob(os.path.join(self.directory, "*.json")):
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+class Fetcher:
+    """
+    Téléchargement des pages : une seule session requests (connexions
+    réutilisées), requêtes concurrentes sur un pool de threads et cache disque
+    avec revalidation ETag / Last-Modified. cache=None désactive le cache.
+    """
+
+    def __init__(self, cache=None, workers=8, timeout=HTTP_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.cache = cache
+        self.workers = workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"network": 0, "cache": 0, "revalidated": 0}
+
+    def fetch(self, url):
+        """Retourne le HTML de url, depuis le cache si possible."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.stats["cache"] += 1
+            return entry["body"]
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and entry is not None:
+            self.stats["revalidated"] += 1
+            self.cache.touch(entry)
+            return entry["body"]
+        resp.raise_for_status()
+        self.stats["network"] += 1
+        if self.cache is not None:
+            self.cache.store(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp.text
+
+    def fetch_many(self, urls):
+        """
+        Télécharge plusieurs URL en parallèle (threads).
+        Retourne {url: html} et {url: message d'erreur}.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        pages, errors = {}, {}
+        if self.cache is not None:
+            self.cache.evict()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {url: executor.submit(self.fetch, url) for url in dict.fromkeys(urls)}
+            for url, future in futures.items():
+                try:
+                    pages[url] = future.result()
+                except Exception as e:
+                    errors[url] = f"{type(e).__name__}: {e}"
+        return pages, errors
+
+_FETCHER = None
+_FETCHER_OPTIONS = {"cache_dir": HTTP_CACHE_DIR, "ttl": HTTP_CACHE_TTL, "use_cache": True}
+
+def configure_fetcher(cache_dir=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, use_cache=True):
+    """Change les réglages du cache HTTP ; le Fetcher partagé est recréé au prochain usage."""
+    global _FETCHER
+    _FETCHER_OPTIONS.update(cache_dir=cache_dir, ttl=ttl, use_cache=use_cache)
+    _FETCHER = None
+
+def get_fetcher():
+    """Fetcher partagé par le processus (créé au premier téléchargement)."""
+    global _FETCHER
+    if _FETCHER is None:
+        options = _FETCHER_OPTIONS
+        cache = HttpCache(options["cache_dir"], options["ttl"]) if options["use_cache"] else None
+        _FETCHER = Fetcher(cache)
+    return _FETCHER
+
+RENDER_TABS = 4
+RENDER_TIMEOUT = 20
+# Marqueur des blocs participants : présent dans le HTML brut, la page n'a pas
+# besoin d'être rendue par un navigateur.
+STATIC_MARKER = "<mat-list-item"
+
+class RenderPool:
+    """
+    Rendu JavaScript (pyppeteer / Chromium sans affichage) avec un seul
+    navigateur gardé ouvert d'une extraction à l'autre. Les pages sont rendues
+    en parallèle dans des onglets (tabs au plus), sur une boucle asyncio qui
+    tourne dans un thread dédié : render() s'appelle depuis du code synchrone.
+    Le document de chaque page est celui déjà téléchargé par le Fetcher (cache
+    HTTP) : Chromium ne charge que les scripts et les données de la page.
+    """
+
+    def __init__(self, tabs=RENDER_TABS, timeout=RENDER_TIMEOUT):
+        import asyncio
+        import threading
+        self.tabs = tabs
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._browser = None
+        self._semaphore = None
+        self._lock = None
+
+    async def _ensure_browser(self):
+        import asyncio
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is None:
+                import pyppeteer
+                # Un seul lancement de Chromium, partagé par tous les rendus, sans
+                # gestionnaires de signaux (interdits hors du thread principal) ni
+                # atexit qui relancerait cette boucle : close() ferme le navigateur.
+                self._browser = await pyppeteer.launch(
+                    headless=True, args=["--no-sandbox"],
+                    handleSIGINT=False, handleSIGTERM=False, handleSIGHUP=False, autoClose=False)
+                self._semaphore = asyncio.Semaphore(self.tabs)
+
+    async def _render(self, url, html):
+        import asyncio
+        await self._ensure_browser()
+        document_url = url.split("#")[0]
+
+        def serve(request):
+            # Le document est servi depuis le HTML déjà téléchargé, sans nouvelle requête
+            if request.isNavigationRequest() and request.url.split("#")[0] == document_url:
+                reply = request.respond({"status": 200, "contentType": "text/html; charset=utf-8",
+                                         "body": html})
+            else:
+                reply = request.continue_()
+            asyncio.ensure_future(reply)
+
+        async with self._semaphore:
+            page = await self._browser.newPage()
             try:
-                resp.html.render(timeout=20)
+                await page.setUserAgent(USER_AGENT)
+                await page.setRequestInterception(True)
+                page.on("request", serve)
+                await page.goto(url, timeout=int(self.timeout * 1000))
+                return await page.content()
             except Exception as e:
                 raise RuntimeError(f"Erreur lors du rendu JavaScript : {e}")
-            return resp.html.html
+            finally:
+                await page.close()
+
+    def render(self, url, html):
+        """Retourne le HTML de url (contenu html déjà téléchargé) après exécution du JavaScript."""
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(self._render(url, html), self._loop).result()
+
+    def render_many(self, pages):
+        """
+        Rend plusieurs pages {url: html téléchargé} en parallèle.
+        Retourne {url: html rendu} et {url: message d'erreur}.
+        """
+        import asyncio
+        futures = {url: asyncio.run_coroutine_threadsafe(self._render(url, html), self._loop)
+                   for url, html in pages.items()}
+        rendered, errors = {}, {}
+        for url, future in futures.items():
+            try:
+                rendered[url] = future.result()
+            except Exception as e:
+                errors[url] = f"{type(e).__name__}: {e}"
+        return rendered, errors
+
+    def close(self):
+        """Ferme le navigateur et arrête la boucle (sans effet si déjà fait)."""
+        import asyncio
+        if self._loop.is_closed():
+            return
+        if self._browser is not None:
+            asyncio.run_coroutine_threadsafe(self._browser.close(), self._loop).result()
+            self._browser = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+_RENDER_POOL = None
+
+def get_render_pool():
+    """Pool de rendu partagé par le processus (navigateur lancé au premier rendu)."""
+    global _RENDER_POOL
+    if _RENDER_POOL is None:
+        import atexit
+        _RENDER_POOL = RenderPool()
+        atexit.register(_RENDER_POOL.close)
+    return _RENDER_POOL
+
+def needs_rendering(html_content):
+    """Vrai si les participants ne sont pas dans le HTML brut (page construite en JavaScript)."""
+    return STATIC_MARKER not in html_content
+
+def load_pages(urls):
+    """
+    Charge plusieurs URL : téléchargement statique concurrent (Fetcher, cache
+    HTTP), puis rendu JavaScript, dans des onglets du même navigateur et à
+    partir du HTML téléchargé, uniquement des pages dont le HTML brut ne
+    contient pas les participants.
+    Les pages rendues sont mises en cache (sans revalidation).
+    Retourne {url: html} et {url: message d'erreur}.
+    """
+    fetcher = get_fetcher()
+    pages, errors = fetcher.fetch_many(urls)
+    to_render = [url for url, html in pages.items() if needs_rendering(html)]
+    if not to_render or not PYPPETEER_AVAILABLE:
+        return pages, errors
+    cache = fetcher.cache
+    pending = []
+    for url in to_render:
+        entry = cache.get("rendered:" + url) if cache is not None else None
+        if entry is not None and cache.is_fresh(entry):
+            pages[url] = entry["body"]
         else:
-            resp = requests.get(source, headers=headers, timeout=15)
-            resp.raise_for_status()
-            return resp.text
+            pending.append(url)
+    if pending:
+        rendered, render_errors = get_render_pool().render_many({url: pages[url] for url in pending})
+        for url, html in rendered.items():
+            pages[url] = html
+            if cache is not None:
+                cache.store("rendered:" + url, html)
+        for url, error in render_errors.items():
+            del pages[url]
+            errors[url] = error
+    return pages, errors
+
+def load_html(source):
+    """Charge le HTML depuis un fichier local ou une URL (avec JS si nécessaire et possible)."""
+    if is_url(source):
+        pages, errors = load_pages([source])
+        if source in errors:
+            raise RuntimeError(errors[source])
+        return pages[source]
     else:
         with open(source, encoding="utf-8") as file:
             return file.read()
 
-def extract_tourplay_data(html_content):
+# Séparateurs groupe/ligue dans le nom du coach : ' · ' (point milieu) ou ' - '
+# (tiret entouré d'espaces, mais pas un simple tiret). Compilés une seule fois.
+COACH_GROUP_DOT_RE = re.compile(r"^(.*?)(?:\s*[·]\s*(\w+))?$")
+COACH_GROUP_DASH_RE = re.compile(r"^(.*?)(?:\s-\s(\w+))$")
+NOT_FOUND = "Non trouvé"
+READ_CHUNK_SIZE = 64 * 1024
+
+def split_coach_group(coach_name_full):
+    """Sépare 'Coach · Groupe' (ou 'Coach - Groupe') en (coach, groupe)."""
+    m = COACH_GROUP_DOT_RE.match(coach_name_full)
+    if m and m.group(2):
+        return m.group(1).strip(), m.group(2)
+    m2 = COACH_GROUP_DASH_RE.match(coach_name_full)
+    if m2:
+        return m2.group(1).strip(), m2.group(2)
+    return coach_name_full, ""
+
+def make_participant(coach_name_full, team_name, roster):
+    coach_name, groupe = split_coach_group(coach_name_full)
+    return {
+        "coach": coach_name,
+        "groupe": groupe,
+        "team": team_name,
+        "roster": roster
+    }
+
+def finalize_results(results):
+    """Trie les participants par nom de coach et ajoute leur numéro de position."""
+    results = sorted(results, key=lambda x: x["coach"].lower())
+    for idx, row in enumerate(results, 1):
+        row["num"] = idx
+    return results
+
+class TourplayStreamParser(HTMLParser):
     """
-    Extrait tous les coachs, équipes et rosters à partir du HTML.
-    Retourne une liste de dictionnaires.
+    Parseur en flux (SAX) des pages participants Tourplay : ne garde en mémoire
+    que le bloc mat-list-item en cours. Reproduit les règles de l'extraction
+    BeautifulSoup : dans chaque bloc, le premier div 'ellipsis' de style
+    'line-height: 16px;' (nom du coach dans son premier span), le premier div
+    'ellipsis title-roster-list' (équipe) et le premier span
+    'mat-caption--small ng-star-inserted' (roster).
+    Les participants complets sont accumulés dans self.items. Un bloc dont la
+    balise fermante manque est clos par le bloc suivant ou par close() en fin
+    de document, comme BeautifulSoup le garde dans l'arbre.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "param", "source", "track", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []
+        self._item = None       # champs du bloc en cours
+        self._stack = []        # balises ouvertes dans le bloc : (tag, rôle)
+        self._capture = []      # rôles dont on collecte le texte
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "mat-list-item":
+            if self._item is not None:
+                # </mat-list-item> manquant : le bloc précédent s'arrête ici
+                self._close_item()
+            self._item = {"coach_div": False, "coach": None, "team": None, "roster": None}
+            self._stack = []
+            self._capture = []
+            return
+        if self._item is None or tag in self.VOID_TAGS:
+            return
+        role = None
+        item = self._item
+        if tag == "div":
+            attributes = dict(attrs)
+            classes = attributes.get("class") or ""
+            if (not item["coach_div"] and "ellipsis" in classes.split()
+                    and attributes.get("style") == "line-height: 16px;"):
+                item["coach_div"] = True
+                role = "coach_div"
+            elif item["team"] is None and classes == "ellipsis title-roster-list":
+                item["team"] = []
+                role = "team"
+        elif tag == "span":
+            if item["coach"] is None and any(r == "coach_div" for _, r in self._stack):
+                item["coach"] = []
+                role = "coach"
+            elif item["roster"] is None and dict(attrs).get("class") == "mat-caption--small ng-star-inserted":
+                item["roster"] = []
+                role = "roster"
+        self._stack.append((tag, role))
+        if role in ("coach", "team", "roster"):
+            self._capture.append(role)
+
+    def handle_endtag(self, tag):
+        if self._item is None:
+            return
+        if tag == "mat-list-item" and not any(t == tag for t, _ in self._stack):
+            self._close_item()
+            return
+        # Ferme jusqu'à la balise correspondante (HTML mal imbriqué toléré)
+        if not any(t == tag for t, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            if role in self._capture:
+                self._capture.remove(role)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for role in self._capture:
+            self._item[role].append(data)
+
+    def close(self):
+        super().close()
+        if self._item is not None:
+            # Document tronqué : le dernier bloc n'a pas été fermé
+            self._close_item()
+
+    def _close_item(self):
+        item = self._item
+        def text(parts):
+            return "".join(parts).strip() if parts is not None else NOT_FOUND
+        self.items.append(make_participant(text(item["coach"]), text(item["team"]), text(item["roster"])))
+        self._item = None
+        self._stack = []
+        self._capture = []
+
+def iter_tourplay_participants(chunks):
+    """
+    Parcourt le HTML fourni par morceaux (itérable de str) et produit chaque
+    participant dès que son bloc mat-list-item est fermé.
+    """
+    parser = TourplayStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.items:
+            yield from parser.items
+            parser.items = []
+    parser.close()
+    yield from parser.items
+
+def read_chunks(path, size=READ_CHUNK_SIZE):
+    """Lit un fichier texte par blocs de size caractères."""
+    with open(path, encoding="utf-8") as file:
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+            yield chunk
+
+def extract_tourplay_data_stream(html_content):
+    """Extraction en flux (html.parser, sans construire d'arbre)."""
+    return list(iter_tourplay_participants([html_content]))
+
+def extract_tourplay_data_bs4(html_content, builder='html.parser'):
+    """Extraction historique via un arbre BeautifulSoup (html.parser par défaut)."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, builder)
     results = []
     
     # Recherche tous les blocs mat-list-item qui contiennent les informations
-    import re
     for item in soup.find_all('mat-list-item'):
         # Extraction du nom du coach
         coach_div = item.find('div', class_='ellipsis', style='line-height: 16px;')
-        coach_name_full = coach_div.find('span').text.strip() if coach_div and coach_div.find('span') else "Non trouvé"
-        # Séparation du groupe/ligue uniquement si ' · ' (point milieu) ou ' - ' (tiret entouré d'espaces)
-        m = re.match(r"^(.*?)(?:\s*[·]\s*(\w+))?$", coach_name_full)
-        if not m or not m.group(2):
-            # Essai avec ' - ' entouré d'espaces (mais pas un simple tiret)
-            m2 = re.match(r"^(.*?)(?:\s-\s(\w+))$", coach_name_full)
-            if m2:
-                coach_name = m2.group(1).strip()
-                groupe = m2.group(2)
-            else:
-                coach_name = coach_name_full
-                groupe = ""
-        else:
-            coach_name = m.group(1).strip()
-            groupe = m.group(2)
+        coach_name_full = coach_div.find('span').text.strip() if coach_div and coach_div.find('span') else NOT_FOUND
 
         # Extraction du nom de l'équipe
         team_div = item.find('div', class_='ellipsis title-roster-list')
-        team_name = team_div.text.strip() if team_div else "Non trouvé"
+        team_name = team_div.text.strip() if team_div else NOT_FOUND
 
         # Extraction du roster (race)
         roster_span = item.find('span', class_='mat-caption--small ng-star-inserted')
-        roster = roster_span.text.strip() if roster_span else "Non trouvé"
-
-        results.append({
-            "coach": coach_name,
-            "groupe": groupe,
-            "team": team_name,
-            "roster": roster
-        })
-    
-    # Trie les résultats par nom de coach
-    results = sorted(results, key=lambda x: x["coach"].lower())
-    
-    # Ajoute un numéro de position à chaque entrée
-    for idx, row in enumerate(results, 1):
-        row["num"] = idx
-        
+        roster = roster_span.text.strip() if roster_span else NOT_FOUND
+
+        results.append(make_participant(coach_name_full, team_name, roster))
+    return results
+
+def extract_tourplay_data_html5lib(html_content):
+    """Extraction BeautifulSoup avec le constructeur html5lib (le plus tolérant, le plus lent)."""
+    return extract_tourplay_data_bs4(html_content, 'html5lib')
+
+_LXML_XPATHS = None
+
+def extract_tourplay_data_lxml(html_content):
+    """Extraction via lxml (libxml2) et des requêtes XPath compilées une seule fois."""
+    global _LXML_XPATHS
+    from lxml import etree, html as lxml_html
+    if _LXML_XPATHS is None:
+        _LXML_XPATHS = (
+            etree.XPath("//mat-list-item"),
+            etree.XPath(".//div[contains(concat(' ', normalize-space(@class), ' '), ' ellipsis ')"
+                        " and @style='line-height: 16px;'][1]"),
+            etree.XPath(".//span"),
+            etree.XPath(".//div[@class='ellipsis title-roster-list']"),
+            etree.XPath(".//span[@class='mat-caption--small ng-star-inserted']"),
+        )
+    items_xp, coach_xp, span_xp, team_xp, roster_xp = _LXML_XPATHS
+
+    def first_text(nodes):
+        return nodes[0].text_content().strip() if nodes else NOT_FOUND
+
+    if isinstance(html_content, str):
+        html_content = html_content.encode("utf-8")
+    tree = lxml_html.document_fromstring(
+        html_content, parser=lxml_html.HTMLParser(encoding="utf-8"))
+    results = []
+    for item in items_xp(tree):
+        coach_divs = coach_xp(item)
+        coach_name_full = first_text(span_xp(coach_divs[0]) if coach_divs else [])
+        results.append(make_participant(coach_name_full, first_text(team_xp(item)), first_text(roster_xp(item))))
+    return results
+
+def extract_tourplay_data_selectolax(html_content):
+    """Extraction via selectolax (moteur lexbor) et des sélecteurs CSS."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    def text(node):
+        return node.text(deep=True).strip() if node is not None else NOT_FOUND
+
+    results = []
+    for item in LexborHTMLParser(html_content).css("mat-list-item"):
+        coach_div = item.css_first('div.ellipsis[style="line-height: 16px;"]')
+        coach_name_full = text(coach_div.css_first("span") if coach_div is not None else None)
+        team = text(item.css_first('div[class="ellipsis title-roster-list"]'))
+        roster = text(item.css_first('span[class="mat-caption--small ng-star-inserted"]'))
+        results.append(make_participant(coach_name_full, team, roster))
     return results
 
+# Moteurs d'extraction : nom -> (module requis, fonction). "auto" prend le
+# premier disponible dans PARSER_PREFERENCE, du plus rapide au plus lent
+# (mesuré par benchmarks/bench_tourplay_parsers.py).
+EXTRACTION_ENGINES = {
+    "selectolax": ("selectolax", extract_tourplay_data_selectolax),
+    "lxml": ("lxml", extract_tourplay_data_lxml),
+    "stream": (None, extract_tourplay_data_stream),
+    "bs4": ("bs4", extract_tourplay_data_bs4),
+    "html5lib": ("html5lib", extract_tourplay_data_html5lib),
+}
+PARSER_PREFERENCE = ["selectolax", "lxml", "stream", "bs4", "html5lib"]
+
+def engine_available(engine):
+    module, _ = EXTRACTION_ENGINES[engine]
+    if engine == "html5lib" and importlib.util.find_spec("bs4") is None:
+        return False
+    return module is None or importlib.util.find_spec(module) is not None
+
+def available_engines():
+    """Moteurs utilisables ici, du plus rapide au plus lent."""
+    return [engine for engine in PARSER_PREFERENCE if engine_available(engine)]
+
+def select_engine(engine="auto"):
+    if engine == "auto":
+        return available_engines()[0]
+    if engine not in EXTRACTION_ENGINES:
+        raise ValueError(f"Moteur d'extraction inconnu : {engine} (attendu : auto, {', '.join(PARSER_PREFERENCE)})")
+    if not engine_available(engine):
+        raise ValueError(f"Le moteur d'extraction '{engine}' n'est pas installé.")
+    return engine
+
+def extract_tourplay_data(html_content, engine="auto"):
+    """
+    Extrait tous les coachs, équipes et rosters à partir du HTML.
+    Retourne une liste de dictionnaires triée par coach et numérotée.
+    engine choisit le moteur (voir EXTRACTION_ENGINES) ; "auto" prend le plus
+    rapide disponible. En cas d'échec, on se replie sur le moteur "stream",
+    puis sur BeautifulSoup si la bibliothèque est installée.
+    """
+    engine = select_engine(engine)
+    for candidate in [engine] + [e for e in ("stream", "bs4") if e != engine]:
+        if not engine_available(candidate):
+            continue
+        try:
+            return finalize_results(EXTRACTION_ENGINES[candidate][1](html_content))
+        except Exception:
+            if candidate == "bs4" or (candidate == "stream" and not engine_available("bs4")):
+                raise
+
+def extract_tourplay_file(path, engine="auto"):
+    """
+    Extrait un fichier HTML local. Avec le moteur "stream", le fichier est lu
+    par blocs sans être chargé entièrement en mémoire.
+    """
+    engine = select_engine(engine)
+    if engine != "stream":
+        with open(path, encoding="utf-8") as file:
+            return extract_tourplay_data(file.read(), engine)
+    try:
+        results = list(iter_tourplay_participants(read_chunks(path)))
+    except Exception:
+        if not engine_available("bs4"):
+            raise
+        with open(path, encoding="utf-8") as file:
+            results = extract_tourplay_data_bs4(file.read())
+    return finalize_results(results)
+
+def extract_tourplay_source(source, engine="auto"):
+    """Extrait les participants d'un fichier local ou d'une URL."""
+    if source.startswith('http://') or source.startswith('https://'):
+        return extract_tourplay_data(load_html(source), engine)
+    return extract_tourplay_file(source, engine)
+
 def show_results(results):
     """Affiche les résultats dans une fenêtre Tkinter."""
+    import tkinter as tk
+    from tkinter import scrolledtext
     result_text = f"Nombre de coachs extraits : {len(results)}\n\n"
     for row in results:
         result_text += (
@@ -105,22 +639,32 @@ def show_results(results):
     text_area.insert(tk.END, result_text)
     text_area.config(state=tk.DISABLED)
 
-def save_results(results):
-    """Sauvegarde les résultats dans des fichiers JSON et CSV."""
-    import os
-    export_dir = "tourplay_data_exported"
+EXPORT_DIR = "tourplay_data_exported"
+EXPORT_BASENAME = "coachs_extract"
+CSV_FIELDNAMES = ["num", "coach", "groupe", "team", "roster"]
+BATCH_REPORT_FILENAME = "batch_report.json"
+HTML_EXTENSIONS = (".html", ".htm")
+
+def write_results(results, export_dir=EXPORT_DIR, basename=EXPORT_BASENAME):
+    """Écrit les participants dans basename.json et basename.csv. Retourne les deux chemins."""
     os.makedirs(export_dir, exist_ok=True)
 
-    json_filename = os.path.join(export_dir, "coachs_extract.json")
+    json_filename = os.path.join(export_dir, basename + ".json")
     with open(json_filename, "w", encoding="utf-8") as fjson:
         json.dump(results, fjson, ensure_ascii=False, indent=2)
 
-    csv_filename = os.path.join(export_dir, "coachs_extract.csv")
-    fieldnames = ["num", "coach", "groupe", "team", "roster"]
+    csv_filename = os.path.join(export_dir, basename + ".csv")
     with open(csv_filename, "w", encoding="utf-8", newline='') as fcsv:
-        writer = csv.DictWriter(fcsv, fieldnames=fieldnames)
+        writer = csv.DictWriter(fcsv, fieldnames=CSV_FIELDNAMES)
         writer.writeheader()
         writer.writerows(results)
+    return json_filename, csv_filename
+
+def save_results(results):
+    """Sauvegarde les résultats dans des fichiers JSON et CSV."""
+    from tkinter import messagebox
+    export_dir = EXPORT_DIR
+    json_filename, csv_filename = write_results(results, export_dir)
 
     messagebox.showinfo(
         "Sauvegarde réussie",
@@ -131,9 +675,9 @@ def save_results(results):
 
 def handle_extraction(source):
     """Gère le flux d'extraction, d'affichage et de sauvegarde."""
+    from tkinter import messagebox
     try:
-        html_content = load_html(source)
-        results = extract_tourplay_data(html_content)
+        results = extract_tourplay_source(source)
         show_results(results)
         save_results(results)
     except Exception as e:
@@ -141,6 +685,7 @@ def handle_extraction(source):
 
 def select_file():
     """Ouvre une boîte de dialogue pour sélectionner un fichier."""
+    from tkinter import filedialog
     file_path = filedialog.askopenfilename(
         title="Sélectionner un fichier HTML",
         filetypes=[("Fichiers HTML", "*.htm;*.html"), ("Tous les fichiers", "*.*")]
@@ -150,10 +695,143 @@ def select_file():
 
 def enter_url():
     """Demande à l'utilisateur d'entrer une URL."""
+    from tkinter import simpledialog
     url = simpledialog.askstring("Entrer une URL", "Veuillez entrer l'URL de la page HTML :")
     if url:
         handle_extraction(url)
 
+def is_url(source):
+    return source.startswith('http://') or source.startswith('https://')
+
+def expand_sources(specs):
+    """
+    Développe une liste de sources : un dossier donne ses pages .html/.htm,
+    un motif glob ses correspondances ; fichiers et URL sont gardés tels quels.
+    Les doublons sont retirés en conservant l'ordre.
+    """
+    sources = []
+    for spec in specs:
+        if is_url(spec):
+            sources.append(spec)
+        elif os.path.isdir(spec):
+            sources.extend(sorted(path for path in glob(os.path.join(spec, "*"))
+                                  if path.lower().endswith(HTML_EXTENSIONS)))
+        elif any(c in spec for c in "*?["):
+            sources.extend(sorted(glob(spec)))
+        else:
+            sources.append(spec)
+    return list(dict.fromkeys(sources))
+
+def division_name(source):
+    """Nom de division déduit de la source : nom du fichier, ou dernier segment de l'URL."""
+    if is_url(source):
+        path = source.split("?", 1)[0].rstrip("/")
+        name = os.path.splitext(path.rsplit("/", 1)[-1])[0] or path
+    else:
+        name = os.path.splitext(os.path.basename(source))[0]
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "division"
+
+def extract_one(source, engine="auto", html_content=None):
+    """
+    Extrait une source dans un processus de travail (html_content : page déjà
+    téléchargée, le cas échéant).
+    Retourne (source, participants, durée en secondes, message d'erreur ou None).
+    """
+    t0 = time.perf_counter()
+    try:
+        if html_content is not None:
+            results = extract_tourplay_data(html_content, engine)
+        else:
+            results = extract_tourplay_source(source, engine)
+        error = None
+    except Exception as e:
+        results, error = [], f"{type(e).__name__}: {e}"
+    return source, results, time.perf_counter() - t0, error
+
+def extract_batch(sources, workers=None, engine="auto"):
+    """
+    Extrait plusieurs pages en parallèle (un processus par page, workers au plus ;
+    None = tous les cœurs, 1 = dans le processus courant).
+    Les URL sont d'abord chargées ensemble par load_pages (threads, cache HTTP,
+    rendu JavaScript si nécessaire), puis transmises aux processus d'extraction.
+    Avec plusieurs sources, chaque participant sans groupe explicite reçoit le
+    nom de la division de sa page.
+    Retourne (participants par division, rapport par source).
+    """
+    urls = [source for source in sources if is_url(source)]
+    pages, fetch_errors = load_pages(urls) if urls else ({}, {})
+    to_parse = [source for source in sources if source not in fetch_errors]
+    htmls = [pages.get(source) for source in to_parse]
+
+    if workers == 1 or len(to_parse) <= 1:
+        parsed = [extract_one(source, engine, html) for source, html in zip(to_parse, htmls)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(extract_one, to_parse, [engine] * len(to_parse), htmls))
+    by_source = {outcome[0]: outcome for outcome in parsed}
+    by_source.update((url, (url, [], 0.0, error)) for url, error in fetch_errors.items())
+    outcomes = [by_source[source] for source in sources]
+
+    by_division = {}
+    report = []
+    for source, results, seconds, error in outcomes:
+        division = division_name(source)
+        # Deux sources peuvent porter le même nom : on les distingue par un suffixe
+        base, k = division, 1
+        while division in by_division:
+            k += 1
+            division = f"{base}_{k}"
+        if len(sources) > 1:
+            for row in results:
+                row["groupe"] = row["groupe"] or division
+        by_division[division] = results
+        report.append({"source": source, "division": division, "participants": len(results),
+                       "seconds": round(seconds, 4), "error": error})
+    return by_division, report
+
+def save_batch(by_division, report, export_dir=EXPORT_DIR, split=False):
+    """
+    Enregistre un lot : un seul coachs_extract.json/.csv fusionné (renuméroté),
+    ou un fichier par division avec split=True, plus batch_report.json.
+    Retourne la liste des fichiers écrits.
+    """
+    written = []
+    if split:
+        for division, results in by_division.items():
+            if results:
+                written.extend(write_results(finalize_results(results), export_dir,
+                                             f"{EXPORT_BASENAME}_{division}"))
+    else:
+        merged = [row for results in by_division.values() for row in results]
+        written.extend(write_results(finalize_results(merged), export_dir))
+    report_path = os.path.join(export_dir, BATCH_REPORT_FILENAME)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    written.append(report_path)
+    return written
+
+def select_directory():
+    """Extraction par lot de toutes les pages HTML d'un dossier (une division par page)."""
+    from tkinter import filedialog, messagebox
+    directory = filedialog.askdirectory(title="Sélectionner un dossier de pages HTML")
+    if not directory:
+        return
+    sources = expand_sources([directory])
+    if not sources:
+        messagebox.showerror("Erreur", "Aucune page .html/.htm dans ce dossier.")
+        return
+    by_division, report = extract_batch(sources)
+    save_batch(by_division, report)
+    merged = finalize_results([row for results in by_division.values() for row in results])
+    show_results(merged)
+    errors = [entry for entry in report if entry["error"]]
+    details = "\n".join(f"{entry['division']} : {entry['participants']} coachs en {entry['seconds']:.2f} s"
+                        + (f" (erreur : {entry['error']})" if entry["error"] else "")
+                        for entry in report)
+    (messagebox.showwarning if errors else messagebox.showinfo)(
+        "Extraction par lot",
+        f"{len(merged)} coachs extraits de {len(report)} page(s) dans '{EXPORT_DIR}' :\n\n{details}")
+
 def load_coachs_from_json(json_path):
     """Charge les coachs depuis un fichier JSON."""
     with open(json_path, encoding="utf-8") as f:
@@ -167,9 +845,10 @@ def load_coachs_from_csv(csv_path):
 
 def main_ui():
     """Initialise l'interface graphique principale."""
+    import tkinter as tk
     root = tk.Tk()
     root.title("Extracteur Coachs Tourplay")
-    root.geometry("500x200")
+    root.geometry("500x250")
     
     label = tk.Label(root, text="Sélectionnez la source des données à extraire :", font=("Arial", 14))
     label.pack(pady=20)
@@ -179,8 +858,49 @@ def main_ui():
     
     btn_url = tk.Button(root, text="Charger depuis une URL", command=enter_url, width=30)
     btn_url.pack(pady=10)
-    
+
+    btn_dir = tk.Button(root, text="Extraction par lot (dossier)", command=select_directory, width=30)
+    btn_dir.pack(pady=10)
+
     root.mainloop()
 
+def main_cli(argv=None):
+    """Extraction en ligne de commande d'une ou plusieurs pages. Retourne le code de sortie."""
+    parser = argparse.ArgumentParser(
+        prog="export_tourplay",
+        description="Extrait les coachs de pages participants Tourplay. Sans argument, ouvre l'interface graphique.")
+    parser.add_argument("sources", nargs="+",
+                        help="Fichiers HTML, dossiers, motifs glob (\"divisions/*.html\") ou URL.")
+    parser.add_argument("--out", default=EXPORT_DIR, help=f"Dossier de sortie (défaut : {EXPORT_DIR}).")
+    parser.add_argument("--split", action="store_true",
+                        help="Un fichier coachs_extract_<division> par page au lieu d'un fichier fusionné.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus d'extraction en parallèle (défaut : tous les cœurs).")
+    parser.add_argument("--engine", default="auto", choices=["auto"] + PARSER_PREFERENCE,
+                        help="Moteur d'analyse HTML (défaut : le plus rapide installé).")
+    parser.add_argument("--cache-dir", default=HTTP_CACHE_DIR,
+                        help=f"Cache des pages téléchargées (défaut : {HTTP_CACHE_DIR}).")
+    parser.add_argument("--cache-ttl", type=int, default=HTTP_CACHE_TTL,
+                        help="Durée en secondes pendant laquelle une page en cache est servie sans requête.")
+    parser.add_argument("--no-cache", action="store_true", help="Désactive le cache HTTP.")
+    args = parser.parse_args(argv)
+    configure_fetcher(args.cache_dir, args.cache_ttl, not args.no_cache)
+
+    sources = expand_sources(args.sources)
+    if not sources:
+        print("Aucune source trouvée.", file=sys.stderr)
+        return 2
+    by_division, report = extract_batch(sources, args.workers, args.engine)
+    for entry in report:
+        status = f"erreur : {entry['error']}" if entry["error"] else f"{entry['participants']} coachs"
+        print(f"{entry['source']} [{entry['division']}] : {status} ({entry['seconds']:.3f} s)")
+    for path in save_batch(by_division, report, args.out, args.split):
+        print(f"Écrit : {path}")
+    return 1 if any(entry["error"] for entry in report) else 0
+
 if __name__ == "__main__":
+    # Exécutables PyInstaller : les processus de extract_batch ne relancent pas l'application
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        sys.exit(main_cli())
     main_ui()
\ No newline at end of file
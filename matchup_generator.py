@@ -2,28 +2,45 @@
 # V3 - Générateur de plannings de matchs
 
 import random
-from typing import List, Tuple, Dict, Any, Set
+from typing import List, Tuple, Dict, Any, Set, Optional, Callable, Union, NamedTuple
 import csv
 import os
 import json
 from datetime import datetime
 import shutil
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+import time
+import hashlib
+from glob import glob
+import multiprocessing
+import threading
+import queue
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+import argparse
+import contextlib
+import importlib.util
+import sys
 import re
 import unicodedata
 
-# Installation des dépendances pour PDF/PNG si nécessaire
-try:
-    import pandas as pd
-    from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-    from reportlab.lib import colors
+# Dépendances pour PDF/PNG : on vérifie seulement leur présence ici, elles ne
+# sont importées qu'au premier export qui en a besoin (démarrage plus rapide).
+REPORTLAB_INSTALLED = importlib.util.find_spec("reportlab") is not None
+if not REPORTLAB_INSTALLED:
+    print("La bibliothèque 'reportlab' n'est pas installée. Les exports PDF seront désactivés.")
+
+MATPLOTLIB_INSTALLED = importlib.util.find_spec("matplotlib") is not None
+if not MATPLOTLIB_INSTALLED:
+    print("La bibliothèque 'matplotlib' n'est pas installée. Les exports PNG seront désactivés.")
+
+
+def load_pyplot():
+    """Importe matplotlib.pyplot au premier rendu PNG, en mode hors écran."""
+    import matplotlib
+    # Rendu hors écran : les exports PNG peuvent tourner hors du thread Tk
+    matplotlib.use("Agg")
     import matplotlib.pyplot as plt
-    PANDAS_INSTALLED = True
-except ImportError:
-    PANDAS_INSTALLED = False
-    print("Les bibliothèques 'pandas', 'reportlab' et 'matplotlib' ne sont pas installées. Les exports PDF et PNG seront désactivés.")
+    return plt
 
 
 def remove_accents(input_str: str) -> str:
@@ -32,69 +49,1074 @@ def remove_accents(input_str: str) -> str:
     return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
 
 
+MANIFEST_FILENAME = "manifest.json"
+
+
+class GenerationCancelled(Exception):
+    """Levée quand l'utilisateur annule une génération en cours."""
+
+
+def check_cancelled(cancel: Optional[threading.Event]):
+    if cancel is not None and cancel.is_set():
+        raise GenerationCancelled()
+
+
+TIMINGS_FILENAME = "timings.json"
+PROFILE_FILENAME = "profile.pstats"
+
+
+class Timings:
+    """
+    Mesures d'une génération : durée de chaque phase, compteurs (tirages par
+    journée, retours arrière) et temps de rendu de chaque fichier exporté.
+    Enregistrées dans timings.json à côté du calendrier.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, Any] = {}
+        self.artifacts: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Chronomètre un bloc ; les durées d'une même phase s'additionnent."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def add_artifact(self, path: str, seconds: float):
+        self.artifacts[path] = seconds
+
+    def to_dict(self, root: Optional[str] = None) -> Dict[str, Any]:
+        """Mesures sérialisables ; les chemins des fichiers sont rendus relatifs à root."""
+        def rel(path):
+            return os.path.relpath(path, root).replace(os.sep, "/") if root else path
+        return {
+            "total": time.perf_counter() - self._start,
+            "phases": self.phases,
+            "counters": self.counters,
+            "artifacts": {rel(path): seconds for path, seconds in sorted(self.artifacts.items())},
+        }
+
+    def save(self, outdir: str) -> str:
+        path = os.path.join(outdir, TIMINGS_FILENAME)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(outdir), f, ensure_ascii=False, indent=2)
+        return path
+
+    def summary(self, top: int = 5) -> str:
+        """Résumé lisible : phases puis fichiers les plus longs à produire."""
+        lines = [f"{name} : {seconds:.3f} s" for name, seconds in self.phases.items()]
+        for name in ("attempts_per_day", "backtracks"):
+            value = self.counters.get(name)
+            if isinstance(value, list) and value:
+                lines.append(f"Tirages par journée : moyenne {sum(value) / len(value):.1f}, max {max(value)}")
+            elif value:
+                lines.append(f"Retours arrière : {value}")
+        home_away = self.counters.get("home_away")
+        if home_away:
+            lines.append(f"Domicile/extérieur : écart max {home_away['max_imbalance']}, "
+                         f"{home_away['breaks']} breaks, plus longue série {home_away['longest_streak']}")
+        slowest = sorted(self.artifacts.items(), key=lambda item: item[1], reverse=True)[:top]
+        if slowest:
+            lines.append("Fichiers les plus longs :")
+            lines.extend(f"  {os.path.basename(path)} : {seconds:.3f} s" for path, seconds in slowest)
+        return "\n".join(lines)
+
+
+def _sha256_json(data: Any) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def schedule_fingerprint(schedule: Dict[str, List[Tuple[int, int]]]) -> str:
+    """
+    Hash SHA-256 canonique d'un calendrier : l'ordre des journées est conservé,
+    l'ordre des matchs dans une journée est ignoré.
+    """
+    return _sha256_json([[day, sorted(list(match) for match in matches)]
+                         for day, matches in schedule.items()])
+
+
+# À incrémenter quand un même seed ne donne plus le même calendrier
+# (2 : orientation domicile/extérieur ; 3 : rééquilibrage d'une dernière phase tronquée ;
+# 4 : exempt à la place fixe du cercle)
+GENERATION_VERSION = 4
+
+
+def generation_key(n_teams: int, n_days: int, seed: int, strategy: str,
+                   constraints: Optional[Dict[str, Any]] = None, legs: int = 1,
+                   return_legs: str = "mirrored") -> str:
+    """Empreinte des paramètres de génération, utilisée comme clé de cache."""
+    return _sha256_json({"n_teams": n_teams, "n_days": n_days, "seed": seed,
+                         "strategy": strategy, "constraints": constraints or {},
+                         "legs": legs, "return_legs": return_legs,
+                         "version": GENERATION_VERSION})
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_manifest(outdir: str, gen: "MatchupGenerator", coachs_file: Optional[str] = None):
+    """Écrit manifest.json (paramètres, seed, empreintes et calendrier) dans le dossier de sortie."""
+    manifest = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "n_teams": gen.n_teams,
+        "n_days": gen.n_days,
+        "seed": gen.seed,
+        "strategy": gen.strategy,
+        "legs": gen.legs,
+        "return_legs": gen.return_legs,
+        "constraints": gen.constraints.to_dict() if gen.constraints else {},
+        "generation_key": gen.cache_key(),
+        "fingerprint": gen.fingerprint(),
+        "coachs_sha256": file_sha256(coachs_file) if coachs_file and os.path.exists(coachs_file) else None,
+        "schedule": {day: [list(match) for match in matches] for day, matches in gen.schedule.items()},
+    }
+    with open(os.path.join(outdir, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def find_cached_schedule(key: str, search_root: str = ".") -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Cherche dans les dossiers generated_* un manifest de même clé de génération
+    dont le calendrier correspond toujours à son empreinte.
+    Retourne (dossier, manifest) du plus récent, ou None.
+    """
+    for path in sorted(glob(os.path.join(search_root, "generated_*", MANIFEST_FILENAME)), reverse=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get("generation_key") != key:
+            continue
+        schedule = {day: [tuple(match) for match in matches]
+                    for day, matches in manifest.get("schedule", {}).items()}
+        if schedule_fingerprint(schedule) != manifest.get("fingerprint"):
+            continue
+        manifest["schedule"] = schedule
+        return os.path.normpath(os.path.dirname(path)), manifest
+    return None
+
+
+# Stratégies de génération disponibles pour MatchupGenerator
+STRATEGIES = ("circle", "matching", "greedy")
+
+# Nombre impair de coachs : un adversaire fantôme (numéro BYE) complète chaque
+# journée ; le coach qui le rencontre est exempt. Chacun l'est une fois par phase.
+BYE = 0
+BYE_LABEL = "Exempt"
+
+
+def season_max_days(n_teams: int, legs: int = 1) -> int:
+    """Nombre maximal de journées pour n_teams coachs en legs phases (exempt compris si impair)."""
+    return legs * (n_teams + n_teams % 2 - 1)
+
+
+# Ordre des journées des phases retour : celui de l'aller ("mirrored") ou tiré au sort ("shuffled")
+RETURN_LEG_MODES = ("mirrored", "shuffled")
+
+# Solveur "matching" : nombre de couplages distincts essayés par journée
+# avant de revenir sur la journée précédente, et plafond global de retours.
+MATCHING_BRANCHING = 8
+MATCHING_MAX_BACKTRACKS = 10000
+
+
+def _low_bit(x: int) -> int:
+    """Indice du bit à 1 le plus faible de x (x > 0)."""
+    return (x & -x).bit_length() - 1
+
+
+class MatchPool:
+    """
+    Pool des rencontres restant à jouer, stocké comme une matrice d'adjacence
+    en bitsets : le bit j de adjacency[i] vaut 1 si la paire (i, j) est encore
+    disponible. Les équipes sont indexées de 0 à n - 1.
+    Test, retrait et ajout d'une paire en O(1) ; n entiers de n bits en mémoire
+    au lieu de n²/2 tuples.
+    """
+
+    __slots__ = ("n", "adjacency", "degrees")
+
+    def __init__(self, n: int):
+        full = (1 << n) - 1
+        self.n = n
+        self.adjacency = [full ^ (1 << i) for i in range(n)]
+        self.degrees = [n - 1] * n
+
+    def has(self, a: int, b: int) -> bool:
+        return (self.adjacency[a] >> b) & 1 == 1
+
+    def remove(self, a: int, b: int):
+        if self.has(a, b):
+            self.adjacency[a] &= ~(1 << b)
+            self.adjacency[b] &= ~(1 << a)
+            self.degrees[a] -= 1
+            self.degrees[b] -= 1
+
+    def add(self, a: int, b: int):
+        if a != b and not self.has(a, b):
+            self.adjacency[a] |= 1 << b
+            self.adjacency[b] |= 1 << a
+            self.degrees[a] += 1
+            self.degrees[b] += 1
+
+    def remove_day(self, match: List[int]):
+        """Retire du pool toutes les paires d'un couplage (match[v] = adversaire de v)."""
+        for v, u in enumerate(match):
+            if v < u:
+                self.remove(v, u)
+
+    def restore_day(self, match: List[int]):
+        """Remet dans le pool toutes les paires d'un couplage."""
+        for v, u in enumerate(match):
+            if v < u:
+                self.add(v, u)
+
+    def partners(self, v: int) -> List[int]:
+        """Adversaires encore disponibles pour v."""
+        result = []
+        bits = self.adjacency[v]
+        while bits:
+            low = bits & -bits
+            result.append(low.bit_length() - 1)
+            bits ^= low
+        return result
+
+    def pick_partner(self, v: int, free: int, rng: random.Random) -> int:
+        """
+        Choisit un adversaire disponible parmi les équipes libres (masque free),
+        à partir d'une position tirée au hasard. Retourne -1 si aucun.
+        """
+        candidates = self.adjacency[v] & free
+        if not candidates:
+            return -1
+        offset = rng.randrange(self.n)
+        high = candidates >> offset
+        if high:
+            return offset + _low_bit(high)
+        return _low_bit(candidates)
+
+    def sample_day(self, rng: random.Random) -> Tuple[List[int], int]:
+        """
+        Tire une journée au hasard : les équipes sont parcourues dans un ordre
+        aléatoire et chacune prend un adversaire libre disponible.
+        Retourne (match, nombre d'équipes restées sans adversaire).
+        """
+        match = [-1] * self.n
+        free = (1 << self.n) - 1
+        order = list(range(self.n))
+        rng.shuffle(order)
+        unmatched = 0
+        for v in order:
+            if not (free >> v) & 1:
+                continue
+            free &= ~(1 << v)
+            u = self.pick_partner(v, free, rng)
+            if u == -1:
+                unmatched += 1
+                continue
+            free &= ~(1 << u)
+            match[v], match[u] = u, v
+        return match, unmatched
+
+    def restricted(self, masks: List[int]) -> "MatchPool":
+        """Copie du pool limitée aux paires permises par masks (masks[v] : adversaires autorisés pour v)."""
+        pool = MatchPool.__new__(MatchPool)
+        pool.n = self.n
+        pool.adjacency = [bits & masks[v] for v, bits in enumerate(self.adjacency)]
+        pool.degrees = [bin(bits).count("1") for bits in pool.adjacency]
+        return pool
+
+    def pairs(self):
+        """Itère sur les paires (i, j), i < j, encore disponibles."""
+        for i in range(self.n):
+            bits = self.adjacency[i] >> (i + 1)
+            while bits:
+                low = bits & -bits
+                yield i, i + low.bit_length()
+                bits ^= low
+
+
+def find_perfect_matching(pool: MatchPool, rng: random.Random) -> Optional[List[int]]:
+    """
+    Cherche un couplage parfait dans le graphe des paires disponibles du pool
+    (algorithme d'Edmonds, contraction des fleurs).
+    Un couplage glouton aléatoire sert de point de départ, puis chaque sommet
+    libre est traité par une recherche de chemin augmentant.
+    Retourne match[v] pour chaque sommet, ou None si aucun couplage parfait n'existe.
+    """
+    n = pool.n
+    match, _ = pool.sample_day(rng)
+    order = list(range(n))
+    rng.shuffle(order)
+    adjacency: Dict[int, List[int]] = {}
+
+    def neighbours(v: int) -> List[int]:
+        if v not in adjacency:
+            adjacency[v] = pool.partners(v)
+        return adjacency[v]
+
+    def augment_from(root: int) -> bool:
+        used = [False] * n
+        parent = [-1] * n
+        base = list(range(n))
+
+        def lowest_common_ancestor(a: int, b: int) -> int:
+            seen = [False] * n
+            while True:
+                a = base[a]
+                seen[a] = True
+                if match[a] == -1:
+                    break
+                a = parent[match[a]]
+            while True:
+                b = base[b]
+                if seen[b]:
+                    return b
+                b = parent[match[b]]
+
+        def mark_path(v: int, b: int, child: int, blossom: List[bool]):
+            while base[v] != b:
+                blossom[base[v]] = blossom[base[match[v]]] = True
+                parent[v] = child
+                child = match[v]
+                v = parent[match[v]]
+
+        used[root] = True
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            v = queue[head]
+            head += 1
+            for to in neighbours(v):
+                if base[v] == base[to] or match[v] == to:
+                    continue
+                if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                    # Cycle impair : contraction de la fleur sur sa base
+                    current_base = lowest_common_ancestor(v, to)
+                    blossom = [False] * n
+                    mark_path(v, current_base, to, blossom)
+                    mark_path(to, current_base, v, blossom)
+                    for i in range(n):
+                        if blossom[base[i]]:
+                            base[i] = current_base
+                            if not used[i]:
+                                used[i] = True
+                                queue.append(i)
+                elif parent[to] == -1:
+                    parent[to] = v
+                    if match[to] == -1:
+                        # Inversion des arêtes le long du chemin augmentant
+                        while to != -1:
+                            pv = parent[to]
+                            ppv = match[pv]
+                            match[to], match[pv] = pv, to
+                            to = ppv
+                        return True
+                    used[match[to]] = True
+                    queue.append(match[to])
+        return False
+
+    for root in order:
+        if match[root] == -1 and not augment_from(root):
+            return None
+    return match
+
+
+def balance_home_away(schedule: Dict[str, List[Tuple[int, int]]],
+                      keep_orientation: bool = False) -> Tuple[Dict[str, List[Tuple[int, int]]], int]:
+    """
+    Oriente chaque match (domicile, extérieur) d'un calendrier quelconque.
+
+    1. Passe linéaire, journée par journée : reçoit l'équipe qui a le moins de
+       matchs à domicile, puis celle qui enchaîne les déplacements depuis le plus
+       longtemps. Avec keep_orientation=True (méthode du cercle, déjà alternée),
+       l'orientation reçue est gardée telle quelle.
+    2. Réparation par chemins augmentants (flot) : tant qu'une équipe a
+       |domicile - extérieur| >= 2, on inverse les matchs le long d'un chemin
+       qui mène à une équipe en déficit ; le bilan des équipes intermédiaires
+       ne change pas. Un tel chemin existe toujours.
+
+    Garantit |domicile - extérieur| <= 1 pour chaque équipe. Les exemptions
+    (BYE) ne comptent pas et sont écrites (équipe, BYE).
+    Retourne (calendrier orienté, nombre de matchs inversés par la réparation).
+    """
+    diff: Dict[int, int] = {}
+    # Série en cours : > 0 à domicile, < 0 à l'extérieur
+    run: Dict[int, int] = {}
+    edges: List[List[int]] = []
+    days: List[Tuple[str, List[List[int]]]] = []
+    for day, matches in schedule.items():
+        oriented = []
+        for a, b in matches:
+            if BYE in (a, b):
+                # Exempt : ni domicile ni extérieur
+                oriented.append([b if a == BYE else a, BYE])
+                continue
+            need_a = -diff.get(a, 0) - 2 * run.get(a, 0)
+            need_b = -diff.get(b, 0) - 2 * run.get(b, 0)
+            home, away = (a, b) if keep_orientation or need_a >= need_b else (b, a)
+            diff[home] = diff.get(home, 0) + 1
+            diff[away] = diff.get(away, 0) - 1
+            run[home] = run[home] + 1 if run.get(home, 0) > 0 else 1
+            run[away] = run[away] - 1 if run.get(away, 0) < 0 else -1
+            edge = [home, away]
+            edges.append(edge)
+            oriented.append(edge)
+        days.append((day, oriented))
+
+    incident: Dict[int, List[int]] = {}
+    for k, (home, away) in enumerate(edges):
+        incident.setdefault(home, []).append(k)
+        incident.setdefault(away, []).append(k)
+
+    def augment(source: int, sign: int) -> int:
+        """Inverse un chemin de source (sign=1 : trop de matchs à domicile) vers une équipe en déficit."""
+        parent: Dict[int, Optional[Tuple[int, int]]] = {source: None}
+        queue = [source]
+        for t in queue:
+            for k in incident[t]:
+                home, away = edges[k]
+                if (home if sign > 0 else away) != t:
+                    continue
+                nxt = away if sign > 0 else home
+                if nxt in parent:
+                    continue
+                parent[nxt] = (k, t)
+                if sign * diff[nxt] <= -1:
+                    length, v = 0, nxt
+                    while parent[v] is not None:
+                        k, v = parent[v]
+                        edges[k].reverse()
+                        length += 1
+                    diff[source] -= 2 * sign
+                    diff[nxt] += 2 * sign
+                    return length
+                queue.append(nxt)
+        return 0
+
+    flips = 0
+    for team in sorted(diff):
+        while abs(diff[team]) >= 2:
+            length = augment(team, 1 if diff[team] > 0 else -1)
+            if not length:
+                break
+            flips += length
+    return {day: [tuple(edge) for edge in oriented] for day, oriented in days}, flips
+
+
+def home_away_stats(schedule: Dict[str, List[Tuple[int, int]]]) -> Dict[str, int]:
+    """
+    Bilan domicile/extérieur d'un calendrier orienté : plus grand écart
+    |domicile - extérieur|, nombre de « breaks » (deux matchs de suite au même
+    endroit) et plus longue série au même endroit.
+    """
+    diff: Dict[int, int] = {}
+    last: Dict[int, int] = {}
+    run: Dict[int, int] = {}
+    breaks = longest = 0
+    for matches in schedule.values():
+        for home, away in matches:
+            if BYE in (home, away):
+                continue
+            for team, venue in ((home, 1), (away, -1)):
+                diff[team] = diff.get(team, 0) + venue
+                if last.get(team) == venue:
+                    breaks += 1
+                    run[team] += 1
+                else:
+                    run[team] = 1
+                last[team] = venue
+                longest = max(longest, run[team])
+    return {"max_imbalance": max((abs(d) for d in diff.values()), default=0),
+            "breaks": breaks, "longest_streak": longest}
+
+
+# Écart minimal par défaut, en journées, entre deux matchs miroirs d'un même coach
+MIRROR_GAP = 3
+
+
+class ScheduleConstraints:
+    """
+    Contraintes de calendrier, vérifiées journée par journée pendant la
+    construction (et non en rejetant des calendriers complets).
+
+    Dures (jamais violées) :
+      - intra_group_from_day : pas de match entre coachs d'un même groupe
+        avant cette journée (1 = aucune restriction) ;
+      - forbidden_pairs : paires de coachs (numéros) qui ne se rencontrent jamais.
+    Souples (respectées si possible, relâchées pour la journée sinon) :
+      - spread_mirror : deux matchs miroirs (même roster des deux côtés) d'un
+        coach sont séparés d'au moins mirror_gap journées ;
+      - avoid_race_streak : pas deux journées de suite contre le même roster.
+
+    groups et rosters associent le numéro de chaque coach à son groupe et à son roster.
+    Chaque journée reçoit des masques d'adversaires autorisés (bitsets, comme
+    MatchPool), du plus strict au moins strict : le générateur prend le premier
+    niveau qui admet une journée complète.
+    """
+
+    def __init__(self, groups: Optional[Dict[int, str]] = None, rosters: Optional[Dict[int, str]] = None,
+                 intra_group_from_day: int = 1, forbidden_pairs=(),
+                 spread_mirror: bool = False, avoid_race_streak: bool = False,
+                 mirror_gap: int = MIRROR_GAP):
+        self.groups = {int(k): v for k, v in (groups or {}).items()}
+        self.rosters = {int(k): v for k, v in (rosters or {}).items()}
+        self.intra_group_from_day = max(1, int(intra_group_from_day))
+        self.forbidden_pairs = sorted({tuple(sorted((int(a), int(b)))) for a, b in forbidden_pairs
+                                       if int(a) != int(b)})
+        self.spread_mirror = bool(spread_mirror)
+        self.avoid_race_streak = bool(avoid_race_streak)
+        self.mirror_gap = max(1, int(mirror_gap))
+        self._masks_n: Optional[int] = None
+
+    @classmethod
+    def from_coachs(cls, coachs_map: Dict[str, Dict[str, Any]], **options) -> "ScheduleConstraints":
+        """Contraintes avec groupes et rosters lus dans les lignes coachs (clés : numéro en texte)."""
+        rows = {int(num): row for num, row in coachs_map.items() if str(num).strip().isdigit()}
+        groups = {num: (row.get("groupe") or "").strip() for num, row in rows.items()}
+        rosters = {num: (row.get("roster") or "").strip() for num, row in rows.items()}
+        return cls(groups, rosters, **options)
+
+    @property
+    def has_soft(self) -> bool:
+        return self.spread_mirror or self.avoid_race_streak
+
+    def __bool__(self) -> bool:
+        return self.intra_group_from_day > 1 or bool(self.forbidden_pairs) or self.has_soft
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Options actives, pour le manifest et la clé de cache ({} sans contrainte)."""
+        if not self:
+            return {}
+        # Les groupes et rosters utilisés déterminent aussi le calendrier
+        used = {}
+        if self.intra_group_from_day > 1:
+            used["groups"] = {str(k): v for k, v in sorted(self.groups.items())}
+        if self.has_soft:
+            used["rosters"] = {str(k): v for k, v in sorted(self.rosters.items())}
+        return {
+            "intra_group_from_day": self.intra_group_from_day,
+            "forbidden_pairs": [list(pair) for pair in self.forbidden_pairs],
+            "spread_mirror": self.spread_mirror,
+            "avoid_race_streak": self.avoid_race_streak,
+            "mirror_gap": self.mirror_gap,
+            "teams_sha256": _sha256_json(used),
+        }
+
+    def _build_masks(self, n: int):
+        if self._masks_n == n:
+            return
+        self._masks_n = n
+
+        def masks_by_value(values: Dict[int, str]) -> Dict[str, int]:
+            by_value: Dict[str, int] = {}
+            for v in range(n):
+                value = values.get(v + 1, "")
+                if value:
+                    by_value[value] = by_value.get(value, 0) | (1 << v)
+            return by_value
+
+        groups = masks_by_value(self.groups)
+        self._roster_teams = masks_by_value(self.rosters)
+        self._group_mask = [groups.get(self.groups.get(v + 1, ""), 0) & ~(1 << v) for v in range(n)]
+        self._roster_mask = [self._roster_teams.get(self.rosters.get(v + 1, ""), 0) & ~(1 << v)
+                             for v in range(n)]
+
+    def max_forbidden_partners(self) -> int:
+        """Plus grand nombre d'adversaires interdits pour un même coach."""
+        counts: Dict[int, int] = {}
+        for pair in self.forbidden_pairs:
+            for team in pair:
+                counts[team] = counts.get(team, 0) + 1
+        return max(counts.values(), default=0)
+
+    def max_days(self, n_teams: int, legs: int = 1) -> int:
+        """
+        Journées atteignables au plus : chaque coach rencontre un adversaire
+        autorisé différent à chaque journée d'une phase, donc une phase perd
+        autant de journées que le coach qui a le plus de paires interdites.
+        """
+        return legs * (season_max_days(n_teams) - self.max_forbidden_partners())
+
+    def check_teams(self, n_teams: int, n_days: Optional[int] = None, legs: int = 1):
+        """
+        Vérifie que les paires interdites désignent des coachs existants
+        (numéros 1 à n_teams) et laissent assez d'adversaires pour n_days journées.
+        """
+        for a, b in self.forbidden_pairs:
+            if a < 1 or b > n_teams:
+                raise ValueError(f"Paire interdite {a}-{b} : coach inconnu "
+                                 f"(numéros attendus de 1 à {n_teams}).")
+        max_days = self.max_days(n_teams, legs)
+        if n_days is not None and n_days > max_days:
+            raise ValueError(f"Avec ces paires interdites, {n_teams} équipes en {legs} phase(s) "
+                             f"jouent au plus {max_days} journées ({n_days} demandées).")
+
+    def prepare(self, pool: MatchPool):
+        """Retire du pool les paires interdites, qui ne seront jamais jouables."""
+        self._build_masks(pool.n)
+        for a, b in self.forbidden_pairs:
+            pool.remove(a - 1, b - 1)
+
+    def day_tiers(self, day: int, previous: List[List[int]], n: int) -> List[List[int]]:
+        """
+        Masques des adversaires autorisés pour la journée day (à partir de 1),
+        du plus strict (dures et souples) au moins strict (dures seules).
+        previous : couplages des journées déjà construites (match[v] = adversaire de v).
+        """
+        self._build_masks(n)
+        full = (1 << n) - 1
+        if day < self.intra_group_from_day:
+            hard = [full & ~self._group_mask[v] for v in range(n)]
+        else:
+            hard = [full] * n
+
+        mirror = None
+        if self.spread_mirror and previous and self.mirror_gap > 1:
+            # Équipes ayant joué un match miroir dans les mirror_gap - 1 dernières journées
+            recent = 0
+            for match in previous[-(self.mirror_gap - 1):]:
+                for v, u in enumerate(match):
+                    if u >= 0 and (self._roster_mask[v] >> u) & 1:
+                        recent |= 1 << v
+            mirror = [full & ~(self._roster_mask[v] if (recent >> v) & 1 else self._roster_mask[v] & recent)
+                      for v in range(n)]
+
+        streak = None
+        if self.avoid_race_streak and previous:
+            last = previous[-1]
+            last_roster = [self.rosters.get(last[v] + 1, "") if last[v] >= 0 else "" for v in range(n)]
+            # Équipes dont le dernier adversaire avait tel roster
+            by_last_roster: Dict[str, int] = {}
+            for v, roster in enumerate(last_roster):
+                if roster:
+                    by_last_roster[roster] = by_last_roster.get(roster, 0) | (1 << v)
+            streak = [full & ~(self._roster_teams.get(last_roster[v], 0)
+                               | by_last_roster.get(self.rosters.get(v + 1, ""), 0))
+                      for v in range(n)]
+
+        tiers = []
+        if mirror is not None and streak is not None:
+            tiers.append([hard[v] & mirror[v] & streak[v] for v in range(n)])
+            # On relâche d'abord l'enchaînement de races, puis l'écart entre miroirs
+            tiers.append([hard[v] & mirror[v] for v in range(n)])
+        elif mirror is not None or streak is not None:
+            soft = mirror if mirror is not None else streak
+            tiers.append([hard[v] & soft[v] for v in range(n)])
+        tiers.append(hard)
+        return tiers
+
+    def violations(self, schedule: Dict[str, List[Tuple[int, int]]]) -> Dict[str, int]:
+        """Nombre de matchs qui ne respectent pas chaque contrainte (journées dans l'ordre du calendrier)."""
+        counts = {"intra_group": 0, "forbidden": 0, "mirror_spacing": 0, "race_streak": 0}
+        forbidden = set(self.forbidden_pairs)
+        last_mirror: Dict[int, int] = {}
+        last_opponent_roster: Dict[int, str] = {}
+        for day, matches in enumerate(schedule.values(), 1):
+            opponent_roster: Dict[int, str] = {}
+            for a, b in matches:
+                if tuple(sorted((a, b))) in forbidden:
+                    counts["forbidden"] += 1
+                group = self.groups.get(a, "")
+                if day < self.intra_group_from_day and group and group == self.groups.get(b, ""):
+                    counts["intra_group"] += 1
+                ra, rb = self.rosters.get(a, ""), self.rosters.get(b, "")
+                if self.spread_mirror and ra and ra == rb:
+                    if any(day - last_mirror[t] < self.mirror_gap for t in (a, b) if t in last_mirror):
+                        counts["mirror_spacing"] += 1
+                    last_mirror[a] = last_mirror[b] = day
+                if self.avoid_race_streak and ((rb and last_opponent_roster.get(a) == rb)
+                                               or (ra and last_opponent_roster.get(b) == ra)):
+                    counts["race_streak"] += 1
+                opponent_roster[a], opponent_roster[b] = rb, ra
+            last_opponent_roster = opponent_roster
+        return counts
+
+
 class MatchupGenerator:
     """
     Générateur de plannings de matchs.
     Garantit que chaque paire de coachs ne se rencontre qu'une seule fois.
+
+    Stratégies :
+      - "circle" (défaut) : méthode de Berger (tournoi à la ronde), équipes
+        placées au hasard sur le cercle et première ronde tirée au sort ; les
+        rondes suivantes se suivent dans l'ordre du cercle. Construit
+        n'importe quel n_days <= n_teams - 1 en O(n²), sans nouvel essai.
+      - "matching" : chaque journée est un couplage parfait (Edmonds) du graphe
+        des paires restantes ; si une journée est impossible, le solveur revient
+        sur les journées précédentes au lieu d'abandonner.
+      - "greedy" : ancien tirage aléatoire avec jusqu'à 1001 tentatives par
+        journée, conservé comme mode historique.
+
+    Chaque match de self.schedule est stocké orienté (domicile, extérieur) par
+    balance_home_away : |domicile - extérieur| <= 1 pour chaque équipe et peu
+    de séries au même endroit. Le cercle garde l'alternance de Berger ; les
+    autres stratégies sont orientées par une passe journée par journée puis
+    réparées. home_away_flips compte les matchs inversés par la réparation.
+
+    constraints (ScheduleConstraints) est appliqué journée par journée ; la
+    méthode du cercle ne peut pas en tenir compte et cède alors la place à
+    "matching", qui devient self.strategy (et donc la stratégie enregistrée
+    dans le manifest et la clé de cache).
+
+    Saison en plusieurs phases (legs > 1, jusqu'à legs * (n_teams - 1)
+    journées) : un seul aller est construit par la stratégie, les phases
+    suivantes en sont dérivées, domicile et extérieur inversés une phase sur
+    deux, dans l'ordre de l'aller ("mirrored") ou dans un ordre tiré au sort
+    ("shuffled"). Chaque paire se rencontre donc exactement une fois par phase.
+
+    Nombre impair d'équipes : un adversaire fantôme (BYE) occupe la place
+    manquante. Les stratégies travaillent sur n_slots = n_teams + 1 places,
+    avec la même complexité et les mêmes garanties ; rencontrer le fantôme
+    signifie être exempt, une fois par phase pour chaque équipe.
     """
 
-    def __init__(self, n_teams: int, n_days: int):
-        if n_teams % 2 != 0:
+    def __init__(self, n_teams: int, n_days: int, strategy: str = "circle",
+                 seed: Optional[int] = None, constraints: Optional[ScheduleConstraints] = None,
+                 legs: int = 1, return_legs: str = "mirrored"):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Stratégie inconnue : {strategy} (attendu : {', '.join(STRATEGIES)}).")
+        if legs < 1:
+            raise ValueError("Le nombre de phases doit être au moins 1.")
+        if return_legs not in RETURN_LEG_MODES:
             raise ValueError(
-                "Le nombre d'équipes doit être pair.")
+                f"Ordre des phases retour inconnu : {return_legs} (attendu : {', '.join(RETURN_LEG_MODES)}).")
         self.n_teams = n_teams
+        # Places du calendrier : une de plus (l'exempt) si le nombre d'équipes est impair
+        self.n_slots = n_teams + n_teams % 2
         self.n_days = n_days
-        self.teams = list(range(1, n_teams + 1))
+        self.constraints = constraints if constraints else None
+        if self.constraints is not None:
+            self.constraints.check_teams(n_teams, n_days, legs)
+            if strategy == "circle":
+                # Le cercle ignore les contraintes : on enregistre la stratégie réellement utilisée
+                strategy = "matching"
+        self.strategy = strategy
+        self.legs = legs
+        self.return_legs = return_legs
+        # Journées d'une phase complète (moins si des paires sont interdites)
+        self.leg_days = self.constraints.max_days(n_teams) if self.constraints else season_max_days(n_teams)
+        # Sans seed explicite, on en tire un pour que le calendrier reste reproductible
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        # Générateur aléatoire isolé : un même seed redonne le même calendrier
+        self.rng = random.Random(self.seed)
+        self.teams = list(range(1, n_teams + 1)) + [BYE] * (self.n_slots - n_teams)
         self.schedule: Dict[str, List[Tuple[int, int]]] = {}
-        self.all_possible_matches: List[Tuple[int, int]] = []
-        for i in range(1, n_teams + 1):
-            for j in range(i + 1, n_teams + 1):
-                self.all_possible_matches.append(tuple(sorted((i, j))))
-
-    def generate(self) -> bool:
+        # Statistiques de la dernière génération : tirages par journée et retours arrière
+        self.attempts_per_day: List[int] = []
+        self.backtracks = 0
+        self.home_away_flips = 0
+        self._progress: Optional[Callable[[str, int, int], None]] = None
+        self._cancel: Optional[threading.Event] = None
+
+    @property
+    def all_possible_matches(self) -> List[Tuple[int, int]]:
+        """Liste de toutes les paires (i, j), i < j. Construite à la demande : O(n²) tuples."""
+        return [(i, j) for i in range(1, self.n_teams + 1)
+                for j in range(i + 1, self.n_teams + 1)]
+
+    def cache_key(self) -> str:
+        """Empreinte des paramètres (équipes, journées, seed, stratégie, contraintes, phases) qui déterminent le calendrier."""
+        return generation_key(self.n_teams, self.n_days, self.seed, self.strategy,
+                              self.constraints.to_dict() if self.constraints else None,
+                              self.legs, self.return_legs)
+
+    def fingerprint(self) -> str:
+        """Empreinte canonique du calendrier généré."""
+        return schedule_fingerprint(self.schedule)
+
+    def to_schedule(self, coachs_map: Dict[str, Dict[str, Any]]) -> "Schedule":
+        """Calendrier en mémoire, enrichi des informations des coachs (clés : numéro en texte)."""
+        return Schedule.from_rounds(self.schedule, coachs_map)
+
+    def generate(self, progress: Optional[Callable[[str, int, int], None]] = None,
+                 cancel: Optional[threading.Event] = None) -> bool:
         """
         Génère un planning de matchs en s'assurant qu'aucune rencontre n'est répétée.
-        Le processus tire au sort les rencontres jour après jour, en retirant les paires utilisées.
+        Délègue à la stratégie choisie à la construction.
+        progress(phase, journée, total) est appelé après chaque journée construite ;
+        si cancel est positionné, la génération s'interrompt avec GenerationCancelled
+        (vérifié à chaque journée et à chaque retour arrière).
         """
-        matches_to_schedule = list(self.all_possible_matches)
-        random.shuffle(matches_to_schedule)
-        
+        self._progress = progress
+        self._cancel = cancel
+        self.attempts_per_day = []
+        self.backtracks = 0
+        total_days = self.n_days
+        if self.legs > 1:
+            # Seul l'aller est construit ; les phases suivantes en sont dérivées
+            self.n_days = min(total_days, self.leg_days)
+        if self.strategy == "greedy":
+            success = self._generate_greedy()
+        elif self.strategy == "matching":
+            success = self._generate_matching()
+        else:
+            success = self._generate_circle()
+        # Le calendrier stocke l'orientation : (domicile, extérieur) ; celle du cercle est déjà alternée
+        self.schedule, self.home_away_flips = balance_home_away(
+            self.schedule, keep_orientation=self.strategy == "circle")
+        if self.legs > 1:
+            success = self._expand_legs(total_days) and success
+        return success
+
+    def _expand_legs(self, total_days: int) -> bool:
+        """
+        Déroule l'aller (self.schedule) en self.legs phases, jusqu'à total_days
+        journées. Les phases paires inversent domicile et extérieur ; en mode
+        "shuffled", l'ordre des journées de chaque phase retour est tiré au sort
+        sans rejouer deux fois de suite les mêmes rencontres. Si la dernière
+        phase est tronquée, balance_home_away répare ensuite la saison entière.
+        """
+        base = list(self.schedule.values())
+        max_days = self.leg_days * self.legs
+        complete = total_days <= max_days
+        if not complete:
+            print(f"Échec : {total_days} journées demandées, {max_days} au maximum pour "
+                  f"{self.n_teams} équipes en {self.legs} phases.")
+            total_days = max_days
+        if len(base) < min(total_days, self.leg_days):
+            # Aller incomplet : les phases retour ne seraient pas valides
+            return False
+
+        self.schedule = {}
+        self.n_days = total_days
+        day = 0
+        last = None
+        for leg in range(self.legs):
+            order = list(range(len(base)))
+            if leg and self.return_legs == "shuffled":
+                self.rng.shuffle(order)
+                if order[0] == last and len(order) > 1:
+                    order.append(order.pop(0))
+            for idx in order:
+                if day == total_days:
+                    break
+                day += 1
+                matches = base[idx] if leg % 2 == 0 else [
+                    (away, home) if away != BYE else (home, away) for home, away in base[idx]]
+                self.schedule[f"Journée {day}"] = list(matches)
+                last = idx
+                if leg:
+                    self._report_day(day)
+        self.n_days = day
+        if day % len(base):
+            # Dernière phase tronquée : domicile et extérieur ne s'y compensent plus.
+            # Seule la réparation s'applique, sur toute la saison : elle n'inverse
+            # que les matchs nécessaires pour revenir à |domicile - extérieur| <= 1
+            self.schedule, flips = balance_home_away(self.schedule, keep_orientation=True)
+            self.home_away_flips += flips
+        return complete
+
+    def _day_tiers(self, previous: List[List[int]]) -> Optional[List[List[int]]]:
+        """Masques d'adversaires autorisés pour la prochaine journée, ou None sans contrainte."""
+        if self.constraints is None:
+            return None
+        return self.constraints.day_tiers(len(previous) + 1, previous, self.n_slots)
+
+    def _find_day(self, remaining: MatchPool, tiers: Optional[List[List[int]]]) -> Optional[List[int]]:
+        """Couplage parfait des paires restantes, au niveau de contraintes le plus strict possible."""
+        if tiers is None:
+            return find_perfect_matching(remaining, self.rng)
+        for masks in tiers:
+            match = find_perfect_matching(remaining.restricted(masks), self.rng)
+            if match is not None:
+                return match
+        return None
+
+    def _report_day(self, day: int):
+        if self._progress is not None:
+            self._progress("Génération", day, self.n_days)
+
+    def _generate_circle(self) -> bool:
+        """
+        Méthode du cercle (Berger) : une équipe reste fixe, les n - 1 autres
+        tournent d'un cran à chaque ronde. Les équipes sont placées au hasard
+        sur le cercle et la première ronde est tirée au sort, ce qui donne un
+        calendrier aléatoire toujours valide.
+        Les rondes se suivent dans l'ordre du cercle pour garder l'alternance
+        domicile/extérieur de Berger : n - 2 breaks seulement sur un aller complet.
+        Avec un nombre impair d'équipes, l'exempt (BYE) occupe la place fixe :
+        l'alternance de cette place ne concerne que des exemptions, et celle des
+        places tournantes ne produit alors aucun break.
+        """
+        self.schedule = {}
+        max_days = self.n_slots - 1
+        complete = self.n_days <= max_days
+        if not complete:
+            print(f"Échec : {self.n_days} journées demandées, {max_days} au maximum pour {self.n_teams} équipes.")
+            self.n_days = max_days
+
+        order = [team for team in self.teams if team != BYE]
+        self.rng.shuffle(order)
+        if len(order) < self.n_slots:
+            order.insert(0, BYE)
+        fixed, rotating = order[0], order[1:]
+        offset = self.rng.randrange(max_days)
+
+        for i in range(1, self.n_days + 1):
+            check_cancelled(self._cancel)
+            r = (offset + i - 1) % max_days
+            # Alternance : l'équipe fixe reçoit une ronde sur deux, les autres selon la parité de k
+            # (l'exempt, toujours à la place fixe, n'en prend pas part)
+            if fixed == BYE:
+                day_matches = [(rotating[r], BYE)]
+            else:
+                day_matches = [(fixed, rotating[r]) if r % 2 == 0 else (rotating[r], fixed)]
+            for k in range(1, self.n_slots // 2):
+                a = rotating[(r + k) % max_days]
+                b = rotating[(r - k) % max_days]
+                day_matches.append((a, b) if k % 2 == 1 else (b, a))
+            self.rng.shuffle(day_matches)
+            self.schedule[f"Journée {i}"] = day_matches
+            self.attempts_per_day.append(1)
+            self._report_day(i)
+
+        return complete
+
+    def _generate_matching(self) -> bool:
+        """
+        Construit chaque journée comme un couplage parfait du graphe des paires
+        restantes. Après chaque journée, on vérifie que chaque équipe garde assez
+        d'adversaires possibles pour les journées suivantes (propagation) ; en cas
+        d'impasse, on défait la journée précédente et on essaie un autre couplage.
+        """
+        self.schedule = {}
+        remaining = MatchPool(self.n_slots)
+        if self.constraints is not None:
+            self.constraints.prepare(remaining)
+
+        days: List[List[int]] = []
+        tried: List[Set[frozenset]] = [set()]
+        attempts = [0]
+        best: List[List[int]] = []
+        backtracks = 0
+        # Couplages tirés par journée, y compris ceux défaits par un retour arrière
+        day_attempts: List[int] = []
+
+        while len(days) < self.n_days:
+            check_cancelled(self._cancel)
+            depth = len(days)
+            days_left = self.n_days - depth - 1
+            chosen = None
+            if depth == len(day_attempts):
+                day_attempts.append(0)
+            tiers = self._day_tiers(days)
+            while attempts[depth] < MATCHING_BRANCHING:
+                attempts[depth] += 1
+                day_attempts[depth] += 1
+                match = self._find_day(remaining, tiers)
+                if match is None:
+                    # Aucun couplage parfait : inutile de réessayer cette journée
+                    attempts[depth] = MATCHING_BRANCHING
+                    break
+                key = frozenset(frozenset((v, u)) for v, u in enumerate(match) if v < u)
+                if key in tried[depth]:
+                    continue
+                tried[depth].add(key)
+                if all(degree - 1 >= days_left for degree in remaining.degrees):
+                    chosen = match
+                    break
+
+            if chosen is None:
+                if depth == 0 or backtracks >= MATCHING_MAX_BACKTRACKS:
+                    break
+                backtracks += 1
+                tried.pop()
+                attempts.pop()
+                remaining.restore_day(days.pop())
+                continue
+
+            remaining.remove_day(chosen)
+            days.append(chosen)
+            tried.append(set())
+            attempts.append(0)
+            self._report_day(len(days))
+            if len(days) > len(best):
+                best = list(days)
+
+        self.attempts_per_day = day_attempts
+        self.backtracks = backtracks
+
+        if len(best) < self.n_days:
+            # Échec : meilleur résultat partiel, prolongé sans la propagation tant
+            # qu'une journée complète existe encore
+            remaining = MatchPool(self.n_slots)
+            if self.constraints is not None:
+                self.constraints.prepare(remaining)
+            for match in best:
+                remaining.remove_day(match)
+            while len(best) < self.n_days:
+                check_cancelled(self._cancel)
+                match = self._find_day(remaining, self._day_tiers(best))
+                if match is None:
+                    break
+                remaining.remove_day(match)
+                best.append(match)
+
+        for i, match in enumerate(best, 1):
+            self.schedule[f"Journée {i}"] = [
+                (self.teams[v], self.teams[u]) for v, u in enumerate(match) if v < u]
+
+        if len(best) < self.n_days:
+            print(f"Échec : Impossible de planifier une journée complète pour la journée {len(best) + 1} après {backtracks} retours arrière. Fin du processus.")
+            self.n_days = len(best)
+            return False
+        return True
+
+    def _generate_greedy(self) -> bool:
+        """
+        Mode historique : tire au sort les rencontres jour après jour, en retirant les paires utilisées.
+        """
+        pool = MatchPool(self.n_slots)
         self.schedule = {}
+        if self.constraints is not None:
+            self.constraints.prepare(pool)
+        days: List[List[int]] = []
         
         for i in range(1, self.n_days + 1):
-            day_matches = []
+            check_cancelled(self._cancel)
+            day_match = None
+            # Avec contraintes, les tentatives passent d'un niveau au suivant, du plus strict au plus souple
+            tiers = self._day_tiers(days)
+            day_pools = [pool.restricted(masks) for masks in tiers] if tiers else [pool]
             
             # Ajout d'une boucle de tentatives pour chaque jour
             for attempt in range(1001):  # 1001 tentatives max
-                teams_for_day: Set[int] = set()
-                current_day_matches = []
-                
-                # Mélange des matchs restants pour une nouvelle tentative
-                random.shuffle(matches_to_schedule)
-                
-                # Algorithme simple pour trouver des matchs pour la journée
-                for match in matches_to_schedule:
-                    if match[0] not in teams_for_day and match[1] not in teams_for_day:
-                        current_day_matches.append(match)
-                        teams_for_day.add(match[0])
-                        teams_for_day.add(match[1])
+                # Tirage d'une journée dans le pool des paires restantes
+                match, unmatched = day_pools[attempt * len(day_pools) // 1001].sample_day(self.rng)
                 
                 # Vérifie si tous les coachs ont une rencontre
-                if len(current_day_matches) * 2 == self.n_teams:
-                    day_matches = current_day_matches
+                if unmatched == 0:
+                    day_match = match
                     break  # Sort de la boucle des tentatives car une solution a été trouvée
+            self.attempts_per_day.append(attempt + 1)
             
             # Si aucune solution n'a été trouvée après 1001 tentatives
-            if not day_matches:
+            if day_match is None:
                 print(f"Échec : Impossible de planifier une journée complète pour la journée {i} après 1001 tentatives. Fin du processus.")
                 self.n_days = i - 1
                 return False
 
-            self.schedule[f"Journée {i}"] = day_matches
+            self.schedule[f"Journée {i}"] = [
+                (self.teams[v], self.teams[u]) for v, u in enumerate(day_match) if v < u]
             
             # Retire les matchs utilisés du pool de matchs restants
-            for match in day_matches:
-                matches_to_schedule.remove(match)
+            pool.remove_day(day_match)
+            days.append(day_match)
+            self._report_day(i)
         
         return True
 
@@ -103,8 +1125,100 @@ class MatchupGenerator:
             writer = csv.writer(fp, delimiter=';')
             writer.writerow(["Journée", "Coach Local", "Coach Visiteur"])
             for day, matches in self.schedule.items():
-                for match in matches:
-                    writer.writerow([day, match[0], match[1]])
+                for home, away in matches:
+                    writer.writerow([day, home, BYE_LABEL if away == BYE else away])
+
+
+def repeat_roster_objective(schedule: Dict[str, List[Tuple[int, int]]],
+                            coachs_map: Dict[str, Dict[str, Any]]) -> float:
+    """
+    Objectif de recherche : nombre de rencontres répétées contre un même roster.
+    Pour chaque coach, matchs joués moins rosters adverses distincts. Plus bas = meilleur.
+    """
+    games: Dict[int, int] = {}
+    rosters: Dict[int, Set[str]] = {}
+    for matches in schedule.values():
+        for a, b in matches:
+            if BYE in (a, b):
+                continue
+            for team, opponent in ((a, b), (b, a)):
+                games[team] = games.get(team, 0) + 1
+                rosters.setdefault(team, set()).add(
+                    coachs_map.get(str(opponent), {}).get("roster", ""))
+    return float(sum(games[team] - len(rosters[team]) for team in games))
+
+
+def _search_candidate(n_teams: int, n_days: int, strategy: str, seed: int, objective,
+                      constraints: Optional[ScheduleConstraints] = None, legs: int = 1,
+                      return_legs: str = "mirrored", cancel: Optional[threading.Event] = None):
+    """Génère et note un calendrier candidat (exécuté dans un processus de travail)."""
+    gen = MatchupGenerator(n_teams, n_days, strategy=strategy, seed=seed, constraints=constraints,
+                           legs=legs, return_legs=return_legs)
+    if not gen.generate(cancel=cancel):
+        return None
+    return objective(gen.schedule), seed, gen.schedule
+
+
+def search_schedules(n_teams: int, n_days: int, objective, n_candidates: int = 32,
+                     top_k: int = 1, strategy: str = "circle", workers: Optional[int] = None,
+                     base_seed: Optional[int] = None, threshold: Optional[float] = None,
+                     time_budget: Optional[float] = None,
+                     constraints: Optional[ScheduleConstraints] = None, legs: int = 1,
+                     return_legs: str = "mirrored",
+                     cancel: Optional[threading.Event] = None) -> List[Tuple[float, int, Dict]]:
+    """
+    Lance n_candidates générations avec des seeds différents, réparties sur un
+    ProcessPoolExecutor, et note chaque calendrier avec objective(schedule)
+    (plus bas = meilleur). objective doit être picklable : fonction de module
+    ou functools.partial, par exemple partial(repeat_roster_objective, coachs_map=...).
+
+    La recherche s'arrête dès qu'un score <= threshold est trouvé ou que
+    time_budget (secondes) est écoulé. workers=1 exécute tout dans le processus courant.
+    constraints, legs et return_legs sont transmis à chaque candidat. Si cancel
+    est positionné, les candidats en attente sont abandonnés et GenerationCancelled est levée.
+    Retourne les top_k meilleurs (score, seed, schedule), triés par score.
+    """
+    seed_rng = random.Random(base_seed)
+    seeds = [seed_rng.getrandbits(32) for _ in range(n_candidates)]
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    results: List[Tuple[float, int, Dict]] = []
+
+    def collect(result) -> bool:
+        """Ajoute un résultat ; retourne True si la recherche doit s'arrêter."""
+        if result is not None:
+            results.append(result)
+            if threshold is not None and result[0] <= threshold:
+                return True
+        return deadline is not None and time.monotonic() >= deadline
+
+    if workers == 1:
+        for seed in seeds:
+            if collect(_search_candidate(n_teams, n_days, strategy, seed, objective, constraints,
+                                         legs, return_legs, cancel)):
+                break
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = {executor.submit(_search_candidate, n_teams, n_days, strategy, seed, objective,
+                                       constraints, legs, return_legs)
+                       for seed in seeds}
+            stop = False
+            while pending and not stop:
+                check_cancelled(cancel)
+                timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                if cancel is not None:
+                    timeout = 0.2 if timeout is None else min(timeout, 0.2)
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stop = collect(future.result()) or stop
+                if deadline is not None and time.monotonic() >= deadline:
+                    stop = True
+        finally:
+            # Après une annulation, on n'attend pas la fin des candidats déjà lancés
+            executor.shutdown(wait=cancel is None or not cancel.is_set(), cancel_futures=True)
+
+    results.sort(key=lambda r: (r[0], r[1]))
+    return results[:top_k]
 
 
 def load_coachs_from_csv(csv_path: str) -> List[Dict[str, str]]:
@@ -124,30 +1238,201 @@ def load_coachs_from_csv(csv_path: str) -> List[Dict[str, str]]:
         return [row for row in reader]
 
 
+ENRICHED_CSV_FILENAME = "matchups_enriched.csv"
+ENRICHED_HEADERS = [
+    "Journée", "Coach Local", "Équipe Local", "Roster Local",
+    "Coach Visiteur", "Équipe Visiteur", "Roster Visiteur"
+]
+
+
+class Participant:
+    """Un coach inscrit : numéro, nom, équipe, roster et groupe."""
+
+    __slots__ = ("num", "coach", "team", "roster", "groupe")
+
+    def __init__(self, num: Optional[int], coach: str, team: str = "", roster: str = "", groupe: str = ""):
+        self.num = num
+        self.coach = coach
+        self.team = team
+        self.roster = roster
+        self.groupe = groupe
+
+    @classmethod
+    def from_row(cls, num: int, row: Dict[str, Any]) -> "Participant":
+        """Construit un participant depuis une ligne de coachs_extract.csv (coach absent : son numéro)."""
+        return cls(num, str(row.get("coach", num)), row.get("team", ""),
+                   row.get("roster", ""), row.get("groupe", ""))
+
+
+class Match:
+    """
+    Une rencontre d'une journée. Se lit aussi comme une ligne du CSV enrichi
+    (match["Coach Local"], match.get(...), match.keys()), ce qui permet aux
+    consommateurs de travailler sur le modèle sans passer par le CSV.
+    """
+
+    __slots__ = ("day", "local", "visiteur")
+
+    _COLUMNS = {
+        "Journée": lambda m: m.day,
+        "Coach Local": lambda m: m.local.coach,
+        "Équipe Local": lambda m: m.local.team,
+        "Roster Local": lambda m: m.local.roster,
+        "Coach Visiteur": lambda m: m.visiteur.coach,
+        "Équipe Visiteur": lambda m: m.visiteur.team,
+        "Roster Visiteur": lambda m: m.visiteur.roster,
+    }
+
+    def __init__(self, day: str, local: Participant, visiteur: Participant):
+        self.day = day
+        self.local = local
+        self.visiteur = visiteur
+
+    def __getitem__(self, column: str) -> str:
+        return self._COLUMNS[column](self)
+
+    def get(self, column: Optional[str], default: Any = None) -> Any:
+        getter = self._COLUMNS.get(column)
+        return getter(self) if getter else default
+
+    def keys(self) -> List[str]:
+        return list(ENRICHED_HEADERS)
+
+    def row(self) -> List[str]:
+        return [getter(self) for getter in self._COLUMNS.values()]
+
+
+class Schedule:
+    """
+    Calendrier en mémoire partagé par la génération, les exports et l'interface.
+    Les participants sont partagés entre les rencontres ; le CSV enrichi n'est
+    qu'un format de sérialisation (to_csv / from_csv).
+    """
+
+    def __init__(self, matches: List[Match]):
+        self.matches = matches
+        self._index: Optional["ScheduleIndex"] = None
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    @classmethod
+    def from_rounds(cls, rounds: Dict[str, List[Tuple[int, int]]],
+                    coachs_map: Dict[str, Dict[str, Any]]) -> "Schedule":
+        """
+        Construit le calendrier à partir de MatchupGenerator.schedule et des coachs
+        par numéro. Chaque paire est lue comme (domicile, extérieur) ; (équipe, BYE)
+        devient un match contre « Exempt ».
+        """
+        participants: Dict[int, Participant] = {}
+
+        def participant(num: int) -> Participant:
+            if num not in participants:
+                participants[num] = Participant.from_row(num, coachs_map.get(str(num), {}))
+            return participants[num]
+
+        matches = []
+        for day, pairs in rounds.items():
+            for home, away in pairs:
+                # Orientation donnée par le calendrier (voir balance_home_away)
+                if away == BYE:
+                    if BYE not in participants:
+                        participants[BYE] = Participant(None, BYE_LABEL)
+                    matches.append(Match(day, participant(home), participants[BYE]))
+                    continue
+                matches.append(Match(day, participant(home), participant(away)))
+        return cls(matches)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Schedule":
+        """Relit un CSV enrichi (les numéros de coachs n'y figurent pas)."""
+        participants: Dict[Tuple[str, str, str], Participant] = {}
+        matches = []
+        rows = load_coachs_from_csv(path)
+        if not rows:
+            return cls(matches)
+        keys = {h.lower(): h for h in rows[0].keys()}
+        if not all(h.lower() in keys for h in ("Journée", "Coach Local", "Coach Visiteur")):
+            raise ValueError("Colonnes requises (Journée, Coach Local, Coach Visiteur) introuvables.")
+
+        def participant(row: Dict[str, str], side: str) -> Participant:
+            info = tuple(row.get(keys.get(f"{col} {side}".lower(), ""), "")
+                         for col in ("coach", "équipe", "roster"))
+            if info not in participants:
+                participants[info] = Participant(None, *info)
+            return participants[info]
+
+        for row in rows:
+            matches.append(Match(row[keys["journée"]], participant(row, "local"), participant(row, "visiteur")))
+        return cls(matches)
+
+    def to_csv(self, filename: str):
+        with open(filename, mode="w", newline="", encoding="utf-8") as fp:
+            writer = csv.writer(fp, delimiter=';')
+            writer.writerow(ENRICHED_HEADERS)
+            for match in self.matches:
+                writer.writerow(match.row())
+
+    def index(self) -> "ScheduleIndex":
+        """Regroupement par journée et par coach, calculé une seule fois."""
+        if self._index is None:
+            self._index = ScheduleIndex(self.matches, headers=ENRICHED_HEADERS)
+        return self._index
+
+
 def save_enriched_matchups_csv(filename: str, schedule: Dict, coachs_map: Dict[str, Dict[str, Any]]):
-    with open(filename, mode="w", newline="", encoding="utf-8") as fp:
-        writer = csv.writer(fp, delimiter=';')
-        writer.writerow([
-            "Journée", "Coach Local", "Équipe Local", "Roster Local",
-            "Coach Visiteur", "Équipe Visiteur", "Roster Visiteur"
-        ])
-        for day, matches in schedule.items():
-            for match in matches:
-                # Assign a consistent home and away team based on their number (e.g., lower number is always home)
-                team1_id, team2_id = sorted(match)
-                
-                local_data = coachs_map.get(str(team1_id), {})
-                visiteur_data = coachs_map.get(str(team2_id), {})
-                
-                writer.writerow([
-                    day,
-                    local_data.get("coach", team1_id),
-                    local_data.get("team", ""),
-                    local_data.get("roster", ""),
-                    visiteur_data.get("coach", team2_id),
-                    visiteur_data.get("team", ""),
-                    visiteur_data.get("roster", "")
-                ])
+    Schedule.from_rounds(schedule, coachs_map).to_csv(filename)
+
+
+def day_number(label: str) -> int:
+    """Numéro d'une journée à partir de son libellé ("Journée 12" -> 12)."""
+    match = re.search(r'(\d+)', label)
+    return int(match.group(1)) if match else 0
+
+
+class ScheduleIndex:
+    """
+    Index des lignes du calendrier enrichi, regroupées en une seule passe par
+    journée et par coach. Les lignes sont des dictionnaires du CSV enrichi ou des
+    Match. Les colonnes sont retrouvées sans tenir compte de la casse.
+    Les exemptions (adversaire BYE_LABEL) figurent dans leur journée et chez le
+    coach exempt, mais « Exempt » n'est pas un coach.
+    Lève ValueError si les colonnes Journée, Coach Local ou Coach Visiteur manquent.
+    """
+
+    def __init__(self, rows: List[Any], headers: Optional[List[str]] = None):
+        self.rows = rows
+        if headers is None:
+            headers = list(rows[0].keys()) if rows else []
+        self.headers = list(headers)
+        self.headers_map = {h.lower(): h for h in self.headers}
+        self.journee_key = self.key('journée')
+        self.local_coach_key = self.key('coach local')
+        self.visiteur_coach_key = self.key('coach visiteur')
+        if not all([self.journee_key, self.local_coach_key, self.visiteur_coach_key]):
+            raise ValueError("Colonnes requises (Journée, Coach Local, Coach Visiteur) introuvables.")
+
+        self.by_day: Dict[str, List[Any]] = {}
+        self.by_coach: Dict[str, List[Any]] = {}
+        for row in rows:
+            self.by_day.setdefault(row[self.journee_key], []).append(row)
+            local, visiteur = row[self.local_coach_key], row[self.visiteur_coach_key]
+            if local != BYE_LABEL:
+                self.by_coach.setdefault(local, []).append(row)
+            if visiteur != local and visiteur != BYE_LABEL:
+                self.by_coach.setdefault(visiteur, []).append(row)
+        self.days = sorted(self.by_day, key=day_number)
+        self.coachs = sorted(self.by_coach)
+
+    def key(self, name: str) -> Optional[str]:
+        """Nom réel de la colonne name (insensible à la casse), ou None."""
+        return self.headers_map.get(name.lower())
+
+    def opponent(self, row: Any, coach: str) -> str:
+        """Adversaire de coach dans la ligne row."""
+        if row[self.local_coach_key] == coach:
+            return row[self.visiteur_coach_key]
+        return row[self.local_coach_key]
 
 
 def ensure_dir(path: str):
@@ -169,15 +1454,20 @@ def save_markdown_table(filename, headers, rows):
             f.write(row_content + '\n')
 
 
-def csv_to_pdf(csv_path, pdf_path):
-    if not PANDAS_INSTALLED:
-        return
-    try:
-        df = pd.read_csv(csv_path, delimiter=';')
-        doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-        table_data = [list(df.columns)] + df.values.tolist()
-        table = Table(table_data, repeatRows=1)
-        style = TableStyle([
+# Modes d'export PDF : un fichier par journée, un PDF unique de la ligue, ou les deux
+PDF_MODES = ("both", "per_day", "league")
+LEAGUE_PDF_FILENAME = "ligue_complete.pdf"
+
+_TABLE_STYLE = None
+
+
+def pdf_table_style():
+    """Style des tableaux PDF, construit une seule fois et partagé par tous les documents."""
+    global _TABLE_STYLE
+    if _TABLE_STYLE is None:
+        from reportlab.platypus import TableStyle
+        from reportlab.lib import colors
+        _TABLE_STYLE = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -187,27 +1477,74 @@ def csv_to_pdf(csv_path, pdf_path):
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
             ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
         ])
-        table.setStyle(style)
-        elements = [table]
-        doc.build(elements)
-    except Exception as e:
-        print(f"Erreur PDF : {e}")
+    return _TABLE_STYLE
 
 
-def csv_to_image(csv_path, img_path):
-    if not PANDAS_INSTALLED:
-        return
+def rows_to_pdf(headers: List[str], rows: List[List[Any]], pdf_path: str):
+    """Rend un tableau (en-têtes + lignes en mémoire) dans un PDF A4."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table
+
+    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
+    table_data = [list(headers)] + [list(row) for row in rows]
+    table = Table(table_data, repeatRows=1)
+    table.setStyle(pdf_table_style())
+    elements = [table]
+    doc.build(elements)
+
+
+def save_league_pdf(headers: List[str], sections: List[Tuple[str, List[Tuple[str, List[List[Any]]]]]],
+                    pdf_path: str):
+    """
+    Écrit un PDF unique pour toute la ligue : une page par entrée, regroupées en
+    sections (par ex. ("Par journée", [(journée, lignes), ...])), avec signets.
+    Un seul document et un seul jeu de styles pour l'ensemble.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, PageBreak
+
+    class LeagueDocTemplate(SimpleDocTemplate):
+        def afterFlowable(self, flowable):
+            bookmark = getattr(flowable, "bookmark", None)
+            if bookmark:
+                key, level = bookmark
+                self.canv.bookmarkPage(key)
+                self.canv.addOutlineEntry(flowable.getPlainText(), key, level=level, closed=level == 0)
+
+    styles = getSampleStyleSheet()
+    table_style = pdf_table_style()
+    elements = []
+    for s_index, (section_title, entries) in enumerate(sections):
+        for e_index, (title, rows) in enumerate(entries):
+            if elements:
+                elements.append(PageBreak())
+            if e_index == 0:
+                heading = Paragraph(section_title, styles["Title"])
+                heading.bookmark = (f"s{s_index}", 0)
+                elements.append(heading)
+            heading = Paragraph(title, styles["Heading2"])
+            heading.bookmark = (f"s{s_index}e{e_index}", 1)
+            elements.append(heading)
+            table = Table([list(headers)] + [list(row) for row in rows], repeatRows=1)
+            table.setStyle(table_style)
+            elements.append(table)
+    LeagueDocTemplate(pdf_path, pagesize=A4, title="Calendrier de la ligue").build(elements)
+
+
+def rows_to_image(headers: List[str], rows: List[List[Any]], img_path: str):
+    """Rend un tableau (en-têtes + lignes en mémoire) dans une image PNG."""
+    n_rows, n_cols = len(rows), len(headers)
+    cell_width = 2.5
+    cell_height = 0.7
+    width = max(8, min(40, n_cols * cell_width))
+    height = max(2, min(40, (n_rows+1) * cell_height))
+    plt = load_pyplot()
+    fig, ax = plt.subplots(figsize=(width, height))
     try:
-        df = pd.read_csv(csv_path, delimiter=';')
-        n_rows, n_cols = df.shape
-        cell_width = 2.5
-        cell_height = 0.7
-        width = max(8, min(40, n_cols * cell_width))
-        height = max(2, min(40, (n_rows+1) * cell_height))
-        fig, ax = plt.subplots(figsize=(width, height))
         ax.axis('off')
-        tbl = ax.table(cellText=df.values, colLabels=df.columns,
-                       loc='center', cellLoc='center')
+        tbl = ax.table(cellText=[[str(cell) for cell in row] for row in rows],
+                       colLabels=headers, loc='center', cellLoc='center')
         tbl.auto_set_font_size(False)
         tbl.set_fontsize(14)
         tbl.scale(1.3, 1.3)
@@ -217,79 +1554,319 @@ def csv_to_image(csv_path, img_path):
             cell.set_height(cell_height/height)
         plt.tight_layout()
         plt.savefig(img_path, bbox_inches='tight', dpi=200)
+    finally:
         plt.close(fig)
-    except Exception as e:
-        print(f"Erreur image : {e}")
 
 
-def generate_per_day_and_per_coach_tables(enriched_csv: str, outdir: str):
-    """Génère les exports détaillés par journée et par coach."""
-    per_day_dir = os.path.join(outdir, 'par_journee')
-    per_coach_dir = os.path.join(outdir, 'par_coach')
-    ensure_dir(per_day_dir)
-    ensure_dir(per_coach_dir)
+def read_csv_table(csv_path: str) -> Tuple[List[str], List[List[str]]]:
+    """Lit un CSV (délimiteur ';') et retourne (en-têtes, lignes)."""
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter=';')
+        headers = next(reader, [])
+        return headers, [row for row in reader]
 
-    with open(enriched_csv, encoding="utf-8") as f:
-        reader = list(csv.DictReader(f, delimiter=';'))
 
-    if not reader:
-        print("Fichier enrichi vide, impossible de générer les tables.")
+def csv_to_pdf(csv_path, pdf_path):
+    if not REPORTLAB_INSTALLED:
         return
+    try:
+        rows_to_pdf(*read_csv_table(csv_path), pdf_path)
+    except Exception as e:
+        print(f"Erreur PDF : {e}")
 
-    headers_map = {h.lower(): h for h in reader[0].keys()}
-    journee_key = headers_map.get('journée')
-    local_coach_key = headers_map.get('coach local')
-    visiteur_coach_key = headers_map.get('coach visiteur')
 
-    if not all([journee_key, local_coach_key, visiteur_coach_key]):
-        print("Colonnes requises (Journée, Coach Local, Coach Visiteur) introuvables.")
+def csv_to_image(csv_path, img_path):
+    if not MATPLOTLIB_INSTALLED:
         return
+    try:
+        rows_to_image(*read_csv_table(csv_path), img_path)
+    except Exception as e:
+        print(f"Erreur image : {e}")
 
-    days = sorted(set(row[journee_key] for row in reader), key=lambda x: int(re.search(r'\d+', x).group()) if re.search(r'\d+', x) else 0)
-
-    for day in days:
-        rows = [row for row in reader if row[journee_key] == day]
-        headers = list(reader[0].keys())
-        sanitized_day = remove_accents(day).replace(' ', '_')
-        md_path = os.path.join(
-            per_day_dir, f"matchups_{sanitized_day}.md")
-        save_markdown_table(md_path, headers, [
-                            [r[h] for h in headers] for r in rows])
-
-        csv_path = os.path.splitext(md_path)[0] + ".csv"
-        with open(csv_path, 'w', encoding='utf-8', newline='') as fcsv:
-            writer = csv.writer(fcsv, delimiter=';')
-            writer.writerow(headers)
-            for r in rows:
-                writer.writerow([r[h] for h in headers])
-
-        pdf_path = os.path.splitext(md_path)[0] + ".pdf"
-        csv_to_pdf(csv_path, pdf_path)
-        
-        img_path = os.path.splitext(md_path)[0] + ".png"
-        csv_to_image(csv_path, img_path)
-
-    coachs = sorted(set(row[local_coach_key] for row in reader) | set(
-        row[visiteur_coach_key] for row in reader))
-    for coach in coachs:
-        rows = [r for r in reader if r[local_coach_key]
-                == coach or r[visiteur_coach_key] == coach]
-        headers = list(reader[0].keys())
-        sanitized_coach = remove_accents(coach).replace(' ', '_')
-        md_path = os.path.join(
-            per_coach_dir, f"matchups_{sanitized_coach}.md")
-        save_markdown_table(md_path, headers, [
-                            [r[h] for h in headers] for r in rows])
-
-        csv_path = os.path.splitext(md_path)[0] + ".csv"
-        with open(csv_path, 'w', encoding='utf-8', newline='') as fcsv:
-            writer = csv.writer(fcsv, delimiter=';')
-            writer.writerow(headers)
-            for r in rows:
-                writer.writerow([r[h] for h in headers])
-
-        img_path = os.path.splitext(md_path)[0] + ".png"
-        csv_to_image(csv_path, img_path)
+
+RENDERERS = {"pdf": rows_to_pdf, "png": rows_to_image, "league_pdf": save_league_pdf}
+
+
+def renderer_available(kind: str) -> bool:
+    return {"pdf": REPORTLAB_INSTALLED, "png": MATPLOTLIB_INSTALLED,
+            "league_pdf": REPORTLAB_INSTALLED}.get(kind, False)
+
+
+def render_artifact(kind: str, headers: List[str], rows: List[Any], dst: str) -> Optional[str]:
+    """
+    Rend un fichier PDF ou PNG à partir de lignes en mémoire (pour "league_pdf",
+    rows contient les sections de save_league_pdf). Exécutable dans un
+    processus de travail : retourne le message d'erreur au lieu de l'afficher.
+    """
+    try:
+        RENDERERS[kind](headers, rows, dst)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def timed_render_artifact(kind: str, headers: List[str], rows: List[Any], dst: str) -> Tuple[Optional[str], float]:
+    """render_artifact, avec la durée du rendu mesurée dans le processus qui l'exécute."""
+    t0 = time.perf_counter()
+    error = render_artifact(kind, headers, rows, dst)
+    return error, time.perf_counter() - t0
+
+
+def run_render_jobs(jobs: List[Tuple[str, List[str], List[List[Any]], str]], workers: Optional[int] = 1,
+                    progress: Optional[Callable[[str, int, int], None]] = None,
+                    cancel: Optional[threading.Event] = None,
+                    timings: Optional[Timings] = None) -> List[Tuple[str, str]]:
+    """
+    Exécute des rendus (kind, en-têtes, lignes, dst). workers=1 rend dans le processus courant,
+    sinon les rendus sont répartis sur un ProcessPoolExecutor (None = tous les cœurs).
+    La durée de chaque rendu est ajoutée à timings s'il est fourni.
+    Retourne la liste des erreurs (fichier, message).
+    """
+    errors: List[Tuple[str, str]] = []
+    if not jobs:
+        return errors
+    if workers == 1:
+        for k, (kind, headers, rows, dst) in enumerate(jobs, 1):
+            check_cancelled(cancel)
+            error, seconds = timed_render_artifact(kind, headers, rows, dst)
+            if timings is not None:
+                timings.add_artifact(dst, seconds)
+            if error:
+                errors.append((dst, error))
+            if progress is not None:
+                progress("Rendu PDF/PNG", k, len(jobs))
+        return errors
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(timed_render_artifact, kind, headers, rows, dst): dst
+                   for kind, headers, rows, dst in jobs}
+        pending = set(futures)
+        done_count = 0
+        while pending:
+            check_cancelled(cancel)
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_count += 1
+                try:
+                    error, seconds = future.result()
+                    if timings is not None:
+                        timings.add_artifact(futures[future], seconds)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                if error:
+                    errors.append((futures[future], error))
+            if done and progress is not None:
+                progress("Rendu PDF/PNG", done_count, len(jobs))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return errors
+
+
+EXPORT_MANIFEST_FILENAME = "export_manifest.json"
+EXPORT_FORMATS = ("csv", "md", "pdf", "png")
+# À incrémenter quand le rendu d'un format change, pour invalider les anciens fichiers
+EXPORT_FORMAT_VERSION = 1
+# Clé réservée de export_manifest.json décrivant ce que l'export contient
+EXPORT_SETTINGS_KEY = "_export"
+
+
+def export_settings(formats: Optional[Set[str]], pdf_mode: str) -> Dict[str, Any]:
+    """
+    Formats effectivement produits par un export (un PDF ou PNG demandé sans
+    reportlab/matplotlib installé n'est pas produit) et mode PDF retenu.
+    """
+    formats = set(EXPORT_FORMATS) if formats is None else set(formats)
+    produced = sorted(f for f in formats if f in ("csv", "md") or renderer_available(f))
+    return {"formats": produced, "pdf_mode": pdf_mode if "pdf" in produced else None}
+
+
+def export_covers(outdir: str, formats: Optional[Set[str]], pdf_mode: str) -> bool:
+    """
+    Vrai si l'export de outdir (export_manifest.json) contient déjà tous les
+    fichiers qu'un export avec formats et pdf_mode produirait maintenant.
+    """
+    try:
+        with open(os.path.join(outdir, EXPORT_MANIFEST_FILENAME), encoding="utf-8") as f:
+            settings = json.load(f).get(EXPORT_SETTINGS_KEY)
+    except (OSError, ValueError, AttributeError):
+        return False
+    if not isinstance(settings, dict) or not settings.get("complete"):
+        return False
+    wanted = export_settings(formats, pdf_mode)
+    if not set(wanted["formats"]) <= set(settings.get("formats") or []):
+        return False
+    return wanted["pdf_mode"] is None or settings.get("pdf_mode") in (wanted["pdf_mode"], "both")
+
+
+def load_previous_export(outdir: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Retrouve le dossier generated_* le plus récent (autre que outdir) possédant
+    un export_manifest.json. Retourne (dossier, {chemin relatif: empreinte}).
+    """
+    root = os.path.dirname(os.path.abspath(outdir))
+    current = os.path.abspath(outdir)
+    for path in sorted(glob(os.path.join(root, "generated_*", EXPORT_MANIFEST_FILENAME)), reverse=True):
+        previous_dir = os.path.dirname(path)
+        if os.path.abspath(previous_dir) == current:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        manifest.pop(EXPORT_SETTINGS_KEY, None)
+        return previous_dir, manifest
+    return None, {}
+
+
+def link_or_copy(src: str, dst: str):
+    """Lien physique si possible (même disque), copie sinon."""
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def generate_per_day_and_per_coach_tables(schedule: Union[str, "Schedule"], outdir: str,
+                                          progress: Optional[Callable[[str, int, int], None]] = None,
+                                          cancel: Optional[threading.Event] = None,
+                                          incremental: bool = True,
+                                          workers: Optional[int] = 1,
+                                          pdf_mode: str = "per_day",
+                                          formats: Optional[Set[str]] = None,
+                                          timings: Optional[Timings] = None) -> List[Tuple[str, str]]:
+    """
+    Génère les exports détaillés par journée et par coach, à partir d'un
+    Schedule en mémoire (ou, à défaut, du chemin d'un CSV enrichi).
+    progress(phase, k, total) est appelé après chaque journée / coach exporté ;
+    si cancel est positionné, l'export s'interrompt avec GenerationCancelled.
+
+    Avec incremental=True, chaque fichier produit est inscrit dans
+    export_manifest.json avec l'empreinte des lignes qui le composent. Les
+    fichiers dont l'empreinte n'a pas changé depuis le dernier dossier generated_*
+    y sont liés (ou copiés) au lieu d'être rendus à nouveau.
+
+    Les rendus PDF/PNG partent directement des lignes en mémoire (sans relire
+    les CSV) et sont exécutés par run_render_jobs avec workers processus.
+    pdf_mode (voir PDF_MODES) choisit entre un PDF par journée, un PDF unique
+    de la ligue (ligue_complete.pdf, une page par journée et par coach) ou les deux.
+    formats limite les fichiers produits (sous-ensemble de EXPORT_FORMATS, tous par défaut).
+    timings, s'il est fourni, reçoit la durée des phases et de chaque fichier produit.
+    Retourne la liste des erreurs de rendu (fichier, message).
+    """
+    per_day_dir = os.path.join(outdir, 'par_journee')
+    per_coach_dir = os.path.join(outdir, 'par_coach')
+    ensure_dir(per_day_dir)
+    ensure_dir(per_coach_dir)
+
+    try:
+        if isinstance(schedule, str):
+            schedule = Schedule.from_csv(schedule)
+        if not schedule.matches:
+            print("Calendrier vide, impossible de générer les tables.")
+            return []
+        index = schedule.index()
+    except ValueError as e:
+        print(e)
+        return []
+
+    headers = index.headers
+    formats = set(EXPORT_FORMATS) if formats is None else set(formats)
+    timings = timings if timings is not None else Timings()
+    previous_dir, previous_manifest = load_previous_export(outdir) if incremental else (None, {})
+    manifest: Dict[str, str] = {}
+    render_jobs: List[Tuple[str, List[str], List[List[str]], str]] = []
+    pending_records: Dict[str, str] = {}
+
+    def up_to_date(path: str, digest: str) -> bool:
+        relpath = os.path.relpath(path, outdir).replace(os.sep, "/")
+        if previous_dir and previous_manifest.get(relpath) == digest:
+            previous_path = os.path.join(previous_dir, relpath)
+            if os.path.exists(previous_path):
+                link_or_copy(previous_path, path)
+                return True
+        return False
+
+    def record(path: str, digest: str):
+        if os.path.exists(path):
+            manifest[os.path.relpath(path, outdir).replace(os.sep, "/")] = digest
+
+    def render(kind: str, payload: List[Any], path: str, digest: str):
+        if up_to_date(path, digest):
+            record(path, digest)
+        elif renderer_available(kind):
+            render_jobs.append((kind, headers, payload, path))
+            pending_records[path] = digest
+
+    def export_group(subdir: str, name: str, rows: List[Match], with_pdf: bool) -> List[List[str]]:
+        table = [[r[h] for h in headers] for r in rows]
+        digest = _sha256_json([EXPORT_FORMAT_VERSION, headers, table])
+        base = os.path.join(subdir, f"matchups_{remove_accents(name).replace(' ', '_')}")
+
+        md_path = base + ".md"
+        if "md" in formats:
+            t0 = time.perf_counter()
+            if not up_to_date(md_path, digest):
+                save_markdown_table(md_path, headers, table)
+            record(md_path, digest)
+            timings.add_artifact(md_path, time.perf_counter() - t0)
+
+        csv_path = base + ".csv"
+        if "csv" in formats:
+            t0 = time.perf_counter()
+            if not up_to_date(csv_path, digest):
+                with open(csv_path, 'w', encoding='utf-8', newline='') as fcsv:
+                    writer = csv.writer(fcsv, delimiter=';')
+                    writer.writerow(headers)
+                    writer.writerows(table)
+            record(csv_path, digest)
+            timings.add_artifact(csv_path, time.perf_counter() - t0)
+
+        if with_pdf and "pdf" in formats:
+            render("pdf", table, base + ".pdf", digest)
+        if "png" in formats:
+            render("png", table, base + ".png", digest)
+        return table
+
+    days = index.days
+    day_sections: List[Tuple[str, List[List[str]]]] = []
+    coach_sections: List[Tuple[str, List[List[str]]]] = []
+
+    with timings.phase("Export par journée"):
+        for k, day in enumerate(days, 1):
+            check_cancelled(cancel)
+            day_sections.append((day, export_group(per_day_dir, day, index.by_day[day], with_pdf=pdf_mode != "league")))
+            if progress is not None:
+                progress("Export par journée", k, len(days))
+
+    coachs = index.coachs
+    with timings.phase("Export par coach"):
+        for k, coach in enumerate(coachs, 1):
+            check_cancelled(cancel)
+            coach_sections.append((coach, export_group(per_coach_dir, coach, index.by_coach[coach], with_pdf=False)))
+            if progress is not None:
+                progress("Export par coach", k, len(coachs))
+
+    if pdf_mode in ("both", "league") and "pdf" in formats:
+        sections = [("Par journée", day_sections), ("Par coach", coach_sections)]
+        render("league_pdf", sections, os.path.join(outdir, LEAGUE_PDF_FILENAME),
+               _sha256_json([EXPORT_FORMAT_VERSION, headers, sections]))
+
+    with timings.phase("Rendu PDF/PNG"):
+        errors = run_render_jobs(render_jobs, workers, progress, cancel, timings)
+    failed = {path for path, _ in errors}
+    for path, digest in pending_records.items():
+        if path not in failed and os.path.exists(path):
+            manifest[os.path.relpath(path, outdir).replace(os.sep, "/")] = digest
+
+    settings = export_settings(formats, pdf_mode)
+    settings["complete"] = not errors
+    with open(os.path.join(outdir, EXPORT_MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({**manifest, EXPORT_SETTINGS_KEY: settings}, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return errors
 
 
 def generate_coachs_template(csv_path: str):
@@ -307,7 +1884,145 @@ def generate_coachs_template(csv_path: str):
         writer.writerows(example_rows)
 
 
+class PipelineResult(NamedTuple):
+    """Résultat de run_generation_pipeline."""
+    outdir: str
+    generator: MatchupGenerator
+    schedule: Schedule
+    reused: bool
+    errors: List[Tuple[str, str]]
+    timings: Optional[Timings] = None
+
+
+def run_generation_pipeline(coachs_file: str, n_days: int, strategy: str = "circle",
+                            seed: Optional[int] = None, n_candidates: int = 1,
+                            render_workers: Optional[int] = None, pdf_mode: str = "both",
+                            formats: Optional[Set[str]] = None, output_root: str = ".",
+                            profile: bool = False, constraints: Optional[Dict[str, Any]] = None,
+                            legs: int = 1, return_legs: str = "mirrored",
+                            progress: Optional[Callable[[str, int, int], None]] = None,
+                            cancel: Optional[threading.Event] = None) -> PipelineResult:
+    """
+    Pipeline complet : génération (ou réutilisation d'un calendrier en cache),
+    CSV brut et enrichi, manifest, puis exports par journée et par coach.
+    Le calendrier est construit une fois en mémoire (Schedule) et partagé par
+    les exports ; les CSV ne servent que de sortie.
+    Ne dépend pas de Tk : peut tourner dans un thread de travail.
+    Les PDF/PNG sont rendus sur render_workers processus (None = tous les cœurs) ;
+    pdf_mode et formats sont transmis à generate_per_day_and_per_coach_tables.
+    Le dossier generated_* est créé dans output_root, où sont aussi cherchés
+    le cache de calendriers et l'export précédent.
+    La durée de chaque phase, les tirages par journée et le temps de chaque
+    fichier sont écrits dans timings.json. Avec profile=True, le pipeline tourne
+    sous cProfile et le profil est enregistré dans profile.pstats (les rendus
+    exécutés dans d'autres processus n'y figurent pas : utiliser render_workers=1).
+    constraints : options de ScheduleConstraints (intra_group_from_day,
+    forbidden_pairs, spread_mirror, avoid_race_streak, mirror_gap) ; groupes et
+    rosters sont lus dans le fichier coachs. Les contraintes non respectées sont
+    comptées dans timings.json.
+    legs et return_legs : saison en plusieurs phases (voir MatchupGenerator).
+    Retourne un PipelineResult (dossier, générateur, calendrier, réutilisé tel quel, erreurs de rendu, mesures).
+    En cas d'annulation, le dossier partiellement écrit est supprimé.
+    """
+    timings = Timings()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        result = _run_generation_pipeline(
+            coachs_file, n_days, strategy, seed, n_candidates, render_workers, pdf_mode,
+            formats, output_root, constraints, legs, return_legs, progress, cancel, timings)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    if profiler is not None and not result.reused:
+        profiler.dump_stats(os.path.join(result.outdir, PROFILE_FILENAME))
+    return result
+
+
+def _run_generation_pipeline(coachs_file, n_days, strategy, seed, n_candidates, render_workers,
+                             pdf_mode, formats, output_root, constraints, legs, return_legs,
+                             progress, cancel, timings: Timings) -> PipelineResult:
+    with timings.phase("Chargement des coachs"):
+        coachs_data = load_coachs_from_csv(coachs_file)
+    required_cols = {"num", "coach", "team", "roster"}
+    if not coachs_data or not required_cols <= set(coachs_data[0].keys()):
+        raise ValueError(f"Le fichier coachs doit contenir les colonnes : {', '.join(sorted(required_cols))}")
+    coachs_map = {str(row["num"]): row for row in coachs_data}
+    schedule_constraints = ScheduleConstraints.from_coachs(coachs_map, **constraints) if constraints else None
+    gen = MatchupGenerator(len(coachs_data), n_days, strategy=strategy, seed=seed,
+                           constraints=schedule_constraints, legs=legs, return_legs=return_legs)
+
+    cached = None
+    if seed is not None and n_candidates <= 1:
+        with timings.phase("Recherche dans le cache"):
+            cached = find_cached_schedule(gen.cache_key(), output_root)
+    if (cached and cached[1].get("coachs_sha256") == file_sha256(coachs_file)
+            and export_covers(cached[0], formats, pdf_mode)):
+        # Mêmes paramètres, même fichier coachs et export complet : rien à recalculer
+        # ni à réexporter. Sinon le calendrier en cache est réexporté (liens physiques
+        # pour les fichiers inchangés).
+        gen.schedule = cached[1]["schedule"]
+        schedule = Schedule.from_csv(os.path.join(cached[0], ENRICHED_CSV_FILENAME))
+        return PipelineResult(cached[0], gen, schedule, True, [], timings)
+
+    with timings.phase("Génération"):
+        if cached:
+            gen.schedule = cached[1]["schedule"]
+            success = True
+        elif n_candidates > 1:
+            # Meilleur calendrier parmi plusieurs seeds (moins de rosters répétés)
+            best = search_schedules(
+                gen.n_teams, n_days, partial(repeat_roster_objective, coachs_map=coachs_map),
+                n_candidates=n_candidates, strategy=gen.strategy, base_seed=seed,
+                constraints=gen.constraints, legs=legs, return_legs=return_legs, cancel=cancel)
+            if best:
+                gen.seed, gen.schedule = best[0][1], best[0][2]
+            success = bool(best)
+            timings.counters["candidates"] = n_candidates
+        else:
+            success = gen.generate(progress, cancel)
+            timings.counters["attempts_per_day"] = gen.attempts_per_day
+            timings.counters["backtracks"] = gen.backtracks
+        timings.counters["home_away"] = home_away_stats(gen.schedule)
+    if not success:
+        raise RuntimeError(f"La génération du calendrier a échoué : {len(gen.schedule)} journée(s) "
+                           f"construite(s) sur {n_days}. Veuillez vérifier les paramètres.")
+    if gen.constraints:
+        timings.counters["constraint_violations"] = gen.constraints.violations(gen.schedule)
+    check_cancelled(cancel)
+
+    date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+    outdir = os.path.normpath(os.path.join(output_root, f"generated_{date_str}"))
+    suffix = 1
+    while os.path.exists(outdir):
+        suffix += 1
+        outdir = os.path.normpath(os.path.join(output_root, f"generated_{date_str}_{suffix}"))
+    ensure_dir(outdir)
+    try:
+        with timings.phase("Calendrier enrichi"):
+            schedule = gen.to_schedule(coachs_map)
+        with timings.phase("CSV et manifest"):
+            gen.save_csv(os.path.join(outdir, "matchups_raw.csv"))
+            schedule.to_csv(os.path.join(outdir, ENRICHED_CSV_FILENAME))
+            write_manifest(outdir, gen, coachs_file)
+        errors = generate_per_day_and_per_coach_tables(
+            schedule, outdir, progress, cancel, workers=render_workers,
+            pdf_mode=pdf_mode, formats=formats, timings=timings)
+    except GenerationCancelled:
+        shutil.rmtree(outdir, ignore_errors=True)
+        raise
+    timings.save(outdir)
+    return PipelineResult(outdir, gen, schedule, False, errors, timings)
+
+
 def main_ui():
+    # Import local : le module reste utilisable sans Tk (CLI, processus de travail)
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+
     root = tk.Tk()
     root.title("Générateur de Matchups V3")
     root.geometry("1100x700")
@@ -320,46 +2035,40 @@ def main_ui():
         pres_win.configure(bg="#2c3e50")
 
         try:
-            from glob import glob
-            gen_dirs = sorted(
-                glob("generated_*/matchups_enriched.csv"), reverse=True)
-            if not gen_dirs:
-                messagebox.showerror("Erreur", "Aucun planning généré trouvé.")
-                pres_win.destroy()
-                return
-
-            enriched_csv = gen_dirs[0]
-            coachs_data = load_coachs_from_csv(enriched_csv)
-
-            if not coachs_data:
+            schedule = current_schedule[0]
+            if schedule is None:
+                # Aucun calendrier en mémoire : on relit le dernier généré
+                gen_dirs = sorted(
+                    glob(f"generated_*/{ENRICHED_CSV_FILENAME}"), reverse=True)
+                if not gen_dirs:
+                    messagebox.showerror("Erreur", "Aucun planning généré trouvé.")
+                    pres_win.destroy()
+                    return
+                try:
+                    schedule = Schedule.from_csv(gen_dirs[0])
+                except ValueError:
+                    messagebox.showerror(
+                        "Erreur", "Colonnes requises absentes du fichier enrichi.")
+                    pres_win.destroy()
+                    return
+
+            if not schedule.matches:
                 messagebox.showerror(
                     "Erreur", "Le fichier de résultats est vide.")
                 pres_win.destroy()
                 return
 
-            headers_map = {h.lower(): h for h in coachs_data[0].keys()}
-            journee_key = headers_map.get('journée')
-            coach_local_key = headers_map.get('coach local')
-            coach_visiteur_key = headers_map.get('coach visiteur')
-            team_local_key = headers_map.get('équipe local')
-            team_visiteur_key = headers_map.get('équipe visiteur')
-            roster_local_key = headers_map.get('roster local')
-            roster_visiteur_key = headers_map.get('roster visiteur')
-
-            if not all([journee_key, coach_local_key, coach_visiteur_key]):
-                messagebox.showerror(
-                    "Erreur", "Colonnes requises absentes du fichier enrichi.")
-                pres_win.destroy()
-                return
+            index = schedule.index()
 
-            def extract_num(j):
-                m = re.search(r'(\d+)', j)
-                return int(m.group(1)) if m else 0
+            coach_local_key = index.local_coach_key
+            coach_visiteur_key = index.visiteur_coach_key
+            team_local_key = index.key('équipe local')
+            team_visiteur_key = index.key('équipe visiteur')
+            roster_local_key = index.key('roster local')
+            roster_visiteur_key = index.key('roster visiteur')
 
-            journees = sorted(list(set(r[journee_key]
-                              for r in coachs_data)), key=extract_num)
-            journee_dict = {
-                j: [r for r in coachs_data if r[journee_key] == j] for j in journees}
+            journees = index.days
+            journee_dict = index.by_day
             current_day_index = 0
             current_match_index = -1
             playing = False
@@ -598,9 +2307,23 @@ def main_ui():
         update_display()
 
     # --- Variables de l'interface ---
+    # Dernier calendrier généré ou affiché, partagé avec la fenêtre de présentation
+    current_schedule: List[Optional[Schedule]] = [None]
     coachs_file_var = tk.StringVar(value="coachs_extract.csv")
     n_teams_var = tk.StringVar()
     n_days_var = tk.StringVar(value="11")
+    strategy_var = tk.StringVar(value=STRATEGIES[0])
+    n_candidates_var = tk.StringVar(value="1")
+    seed_var = tk.StringVar()
+    pdf_mode_var = tk.StringVar(value=PDF_MODES[0])
+    show_timings_var = tk.BooleanVar(value=False)
+    profile_var = tk.BooleanVar(value=False)
+    intra_group_day_var = tk.StringVar(value="1")
+    forbidden_pairs_var = tk.StringVar()
+    spread_mirror_var = tk.BooleanVar(value=False)
+    avoid_race_streak_var = tk.BooleanVar(value=False)
+    legs_var = tk.StringVar(value="1")
+    return_legs_var = tk.StringVar(value=RETURN_LEG_MODES[0])
 
     # Définition des styles pour les lignes du Treeview
     style = ttk.Style()
@@ -635,91 +2358,143 @@ def main_ui():
         coachs_file_var.set(template_file)
         update_n_teams_from_csv()
 
-    # Spinner animé (label)
-    spinner_label = tk.Label(root, text="", font=("TkDefaultFont", 12, "bold"))
+    # Spinner animé (label) et bouton d'annulation
+    spinner_frame = ttk.Frame(root)
+    spinner_label = tk.Label(spinner_frame, text="", font=("TkDefaultFont", 12, "bold"))
+    spinner_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    btn_cancel = ttk.Button(spinner_frame, text="Annuler")
+    btn_cancel.pack(side=tk.RIGHT)
     spinner_running = [False]
+    spinner_status = [""]
     spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
 
     def animate_spinner(idx=0):
         if spinner_running[0]:
             spinner_label.config(
-                text="Génération en cours... " + spinner_frames[idx % len(spinner_frames)])
+                text="Génération en cours... " + spinner_frames[idx % len(spinner_frames)]
+                + " " + spinner_status[0])
             root.after(80, animate_spinner, idx + 1)
         else:
             spinner_label.config(text="")
 
+    def stop_spinner():
+        spinner_running[0] = False
+        spinner_status[0] = ""
+        spinner_frame.pack_forget()
+        btn_generate.config(state=tk.NORMAL)
+
     def do_generate():
         try:
-            spinner_label.pack(fill=tk.X, padx=10, pady=5)
-            spinner_running[0] = True
-            animate_spinner()
-            root.update_idletasks()
             n_teams = int(n_teams_var.get())
             n_days = int(n_days_var.get())
-            if n_teams <= 0 or n_teams % 2 != 0:
-                spinner_running[0] = False
-                spinner_label.pack_forget()
+            legs = int(legs_var.get() or 1)
+            if n_teams < 2:
                 messagebox.showerror(
-                    "Erreur", "Le nombre d'équipes doit être un nombre pair et supérieur à zéro.")
+                    "Erreur", "Il faut au moins deux équipes.")
                 return
             if n_days <= 0:
-                spinner_running[0] = False
-                spinner_label.pack_forget()
                 messagebox.showerror(
                     "Erreur", "Le nombre de journées doit être supérieur à zéro.")
                 return
-
-            # Vérification du nombre maximal de journées possibles
-            max_days = n_teams - 1
-            if n_days > max_days:
-                spinner_running[0] = False
-                spinner_label.pack_forget()
+            if legs <= 0:
                 messagebox.showerror(
-                    "Erreur", f"Le nombre de journées ne peut pas dépasser {max_days} pour {n_teams} équipes.")
+                    "Erreur", "Le nombre de phases doit être supérieur à zéro.")
                 return
 
             coachs_data = load_coachs_from_csv(coachs_file_var.get())
             required_cols = {"num", "coach", "team", "roster"}
             if not coachs_data or not all(col.lower() in [k.lower() for k in coachs_data[0].keys()] for col in required_cols):
-                spinner_running[0] = False
-                spinner_label.pack_forget()
                 messagebox.showerror(
                     "Erreur", f"Le fichier coachs doit contenir les colonnes : {', '.join(required_cols)}")
                 return
 
-            coachs_map = {str(row["num"]): row for row in coachs_data}
+            n_candidates = int(n_candidates_var.get() or 1)
+            seed = int(seed_var.get()) if seed_var.get().strip() else None
+            constraints = constraint_options(
+                int(intra_group_day_var.get() or 1), parse_forbidden_pairs(forbidden_pairs_var.get().split()),
+                spread_mirror_var.get(), avoid_race_streak_var.get())
 
-            gen = MatchupGenerator(n_teams, n_days)
-            if not gen.generate():
-                spinner_running[0] = False
-                spinner_label.pack_forget()
+            # Vérification du nombre maximal de journées possibles (paires interdites comprises)
+            max_days = (ScheduleConstraints(**constraints).max_days(n_teams, legs) if constraints
+                        else season_max_days(n_teams, legs))
+            if n_days > max_days:
                 messagebox.showerror(
-                    "Erreur", "La génération du calendrier a échoué. Veuillez vérifier les paramètres.")
+                    "Erreur", f"Le nombre de journées ne peut pas dépasser {max_days} pour {n_teams} équipes "
+                              f"en {legs} phase(s).")
                 return
-
-            date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-            outdir = f"generated_{date_str}"
-            ensure_dir(outdir)
-
-            enriched_csv = os.path.join(outdir, "matchups_enriched.csv")
-            gen.save_csv(os.path.join(outdir, "matchups_raw.csv"))
-            save_enriched_matchups_csv(enriched_csv, gen.schedule, coachs_map)
-
-            generate_per_day_and_per_coach_tables(enriched_csv, outdir)
-
-            spinner_running[0] = False
-            spinner_label.pack_forget()
-            messagebox.showinfo(
-                "Succès", f"Calendrier généré dans le dossier '{outdir}'.")
-
-            display_results(outdir)
-
         except Exception as e:
-            spinner_running[0] = False
-            spinner_label.pack_forget()
             messagebox.showerror("Erreur", f"Une erreur est survenue : {e}")
+            return
+
+        # Le pipeline tourne dans un thread : la fenêtre reste réactive.
+        # Les événements remontent par une file lue avec root.after.
+        events: "queue.Queue[tuple]" = queue.Queue()
+        cancel = threading.Event()
 
-    def display_results(outdir: str):
+        def worker():
+            try:
+                result = run_generation_pipeline(
+                    coachs_file_var.get(), n_days, strategy=strategy_var.get(), seed=seed,
+                    n_candidates=n_candidates, pdf_mode=pdf_mode_var.get(), cancel=cancel,
+                    profile=profile_var.get(), constraints=constraints,
+                    legs=legs, return_legs=return_legs_var.get(),
+                    progress=lambda phase, k, total: events.put(("progress", phase, k, total)))
+                events.put(("done", result))
+            except GenerationCancelled:
+                events.put(("cancelled",))
+            except Exception as e:
+                events.put(("error", e))
+
+        def poll_events():
+            try:
+                while True:
+                    event = events.get_nowait()
+                    kind = event[0]
+                    if kind == "progress":
+                        spinner_status[0] = f"{event[1]} {event[2]}/{event[3]}"
+                        continue
+                    stop_spinner()
+                    if kind == "done":
+                        result = event[1]
+                        outdir, gen, errors = result.outdir, result.generator, result.errors
+                        if errors:
+                            details = "\n".join(f"{os.path.basename(path)} : {message}"
+                                                for path, message in errors[:10])
+                            messagebox.showwarning(
+                                "Exports incomplets", f"{len(errors)} fichier(s) n'ont pas pu être rendus :\n\n{details}")
+                        if result.reused:
+                            messagebox.showinfo(
+                                "Déjà généré", f"Calendrier identique déjà présent dans le dossier '{outdir}'.")
+                        else:
+                            message = f"Calendrier généré dans le dossier '{outdir}' (seed {gen.seed})."
+                            if gen.constraints:
+                                violations = gen.constraints.violations(gen.schedule)
+                                message += "\n\nContraintes non respectées : " + (
+                                    ", ".join(f"{name} {count}" for name, count in violations.items() if count)
+                                    or "aucune")
+                            messagebox.showinfo("Succès", message)
+                        if show_timings_var.get() and result.timings is not None:
+                            messagebox.showinfo("Mesures de temps", result.timings.summary())
+                        display_results(result.schedule)
+                    elif kind == "cancelled":
+                        messagebox.showinfo("Annulé", "La génération a été annulée.")
+                    else:
+                        messagebox.showerror("Erreur", f"Une erreur est survenue : {event[1]}")
+                    return
+            except queue.Empty:
+                pass
+            root.after(100, poll_events)
+
+        btn_cancel.config(command=cancel.set)
+        btn_generate.config(state=tk.DISABLED)
+        spinner_frame.pack(fill=tk.X, padx=10, pady=5)
+        spinner_running[0] = True
+        animate_spinner()
+        threading.Thread(target=worker, daemon=True).start()
+        poll_events()
+
+    def display_results(schedule: Schedule):
+        current_schedule[0] = schedule
         list_journees.delete(0, tk.END)
         list_coachs.delete(0, tk.END)
 
@@ -729,33 +2504,16 @@ def main_ui():
         text_coach.delete(1.0, tk.END)
 
         try:
-            enriched_csv_path = os.path.join(outdir, "matchups_enriched.csv")
-            coachs_data = load_coachs_from_csv(enriched_csv_path)
-
-            if not coachs_data:
+            if not schedule.matches:
                 messagebox.showerror("Erreur d'affichage",
                                      "Le fichier de résultats est vide.")
                 return
 
-            headers_map = {h.lower(): h for h in coachs_data[0].keys()}
-            journee_key = headers_map.get('journée')
-            coach_local_key = headers_map.get('coach local')
-            coach_visiteur_key = headers_map.get('coach visiteur')
-
-            if not all([journee_key, coach_local_key, coach_visiteur_key]):
-                messagebox.showerror(
-                    "Erreur", "Colonnes 'Journée', 'Coach Local' ou 'Coach Visiteur' absentes du fichier enrichi.")
-                return
+            index = schedule.index()
 
-            def extract_num(j):
-                match = re.search(r'(\d+)', j)
-                return int(match.group(1)) if match else 0
-
-            journees = sorted(set(r[journee_key]
-                              for r in coachs_data), key=extract_num)
-
-            journee_dict = {
-                j: [r for r in coachs_data if r[journee_key] == j] for j in journees}
+            journee_key = index.journee_key
+            journees = index.days
+            journee_dict = index.by_day
             for j in journees:
                 list_journees.insert(tk.END, j)
 
@@ -777,11 +2535,8 @@ def main_ui():
 
             list_journees.bind('<<ListboxSelect>>', show_journee)
 
-            coachs_set = set(r[coach_local_key] for r in coachs_data) | set(
-                r[coach_visiteur_key] for r in coachs_data)
-            coachs_list = sorted(coachs_set)
-            coach_dict = {c: [r for r in coachs_data if r[coach_local_key]
-                              == c or r[coach_visiteur_key] == c] for c in coachs_list}
+            coachs_list = index.coachs
+            coach_dict = index.by_coach
             for c in coachs_list:
                 list_coachs.insert(tk.END, c)
 
@@ -793,7 +2548,7 @@ def main_ui():
                     text_coach.delete(1.0, tk.END)
                     text_coach.insert(tk.END, f"## Matchs de {c}\n\n")
                     for r in rows:
-                        vs = r[coach_visiteur_key] if r[coach_local_key] == c else r[coach_local_key]
+                        vs = index.opponent(r, c)
                         text_coach.insert(
                             tk.END, f"- {r[journee_key]} : vs {vs}\n")
             list_coachs.bind('<<ListboxSelect>>', show_coach)
@@ -833,8 +2588,58 @@ def main_ui():
     ttk.Entry(frame_params, textvariable=n_days_var, width=5).grid(
         row=1, column=3, sticky=tk.W, padx=5)
 
-    ttk.Button(frame_params, text="Générer", command=do_generate).grid(
-        row=2, columnspan=4, pady=10)
+    ttk.Label(frame_params, text="Algorithme :").grid(
+        row=2, column=0, sticky=tk.W, pady=2)
+    ttk.Combobox(frame_params, textvariable=strategy_var, values=STRATEGIES,
+                 state="readonly", width=10).grid(row=2, column=1, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Nb d'essais :").grid(
+        row=2, column=2, sticky=tk.W, pady=2)
+    ttk.Entry(frame_params, textvariable=n_candidates_var, width=5).grid(
+        row=2, column=3, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Seed (optionnel) :").grid(
+        row=3, column=0, sticky=tk.W, pady=2)
+    ttk.Entry(frame_params, textvariable=seed_var, width=12).grid(
+        row=3, column=1, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Export PDF :").grid(
+        row=3, column=2, sticky=tk.W, pady=2)
+    ttk.Combobox(frame_params, textvariable=pdf_mode_var, values=PDF_MODES,
+                 state="readonly", width=10).grid(row=3, column=3, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Nb de phases (2 = aller-retour) :").grid(
+        row=4, column=0, sticky=tk.W, pady=2)
+    ttk.Entry(frame_params, textvariable=legs_var, width=5).grid(
+        row=4, column=1, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Ordre des retours :").grid(
+        row=4, column=2, sticky=tk.W, pady=2)
+    ttk.Combobox(frame_params, textvariable=return_legs_var, values=RETURN_LEG_MODES,
+                 state="readonly", width=10).grid(row=4, column=3, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Intra-groupe dès la journée :").grid(
+        row=5, column=0, sticky=tk.W, pady=2)
+    ttk.Entry(frame_params, textvariable=intra_group_day_var, width=5).grid(
+        row=5, column=1, sticky=tk.W, padx=5)
+
+    ttk.Label(frame_params, text="Paires interdites (1-2 5-8) :").grid(
+        row=5, column=2, sticky=tk.W, pady=2)
+    ttk.Entry(frame_params, textvariable=forbidden_pairs_var, width=20).grid(
+        row=5, column=3, sticky=tk.W, padx=5)
+
+    ttk.Checkbutton(frame_params, text="Espacer les matchs miroirs",
+                    variable=spread_mirror_var).grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=2)
+    ttk.Checkbutton(frame_params, text="Éviter le même roster deux journées de suite",
+                    variable=avoid_race_streak_var).grid(row=6, column=2, columnspan=2, sticky=tk.W, pady=2)
+
+    ttk.Checkbutton(frame_params, text="Afficher les mesures de temps",
+                    variable=show_timings_var).grid(row=7, column=0, columnspan=2, sticky=tk.W, pady=2)
+    ttk.Checkbutton(frame_params, text="Profiler (cProfile)",
+                    variable=profile_var).grid(row=7, column=2, columnspan=2, sticky=tk.W, pady=2)
+
+    btn_generate = ttk.Button(frame_params, text="Générer", command=do_generate)
+    btn_generate.grid(row=8, columnspan=4, pady=10)
 
     notebook = ttk.Notebook(frame_main)
     notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -877,5 +2682,149 @@ def main_ui():
     root.mainloop()
 
 
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="matchup_generator",
+        description="Générateur de plannings de matchs. Sans argument, ouvre l'interface graphique.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gen_parser = subparsers.add_parser(
+        "generate", help="Génère calendrier et exports sans interface graphique.")
+    gen_parser.add_argument("--coachs", action="append", default=[], metavar="CSV",
+                            help="Fichier coachs_extract.csv d'une ligue (répétable pour plusieurs ligues).")
+    gen_parser.add_argument("--config", metavar="JSON",
+                            help="Fichier JSON listant des ligues : [{\"coachs\": ..., \"days\": ..., \"seed\": ..., \"out\": ...}, ...].")
+    gen_parser.add_argument("--days", type=int, default=11, help="Nombre de journées (défaut : 11).")
+    gen_parser.add_argument("--legs", type=int, default=1,
+                            help="Nombre de phases (2 = aller-retour) ; jusqu'à legs * (coachs - 1) journées.")
+    gen_parser.add_argument("--return-legs", choices=RETURN_LEG_MODES, default=RETURN_LEG_MODES[0],
+                            help="Ordre des journées des phases retour : celui de l'aller ou tiré au sort.")
+    gen_parser.add_argument("--seed", type=int, default=None, help="Seed pour un calendrier reproductible.")
+    gen_parser.add_argument("--strategy", choices=STRATEGIES, default=STRATEGIES[0])
+    gen_parser.add_argument("--candidates", type=int, default=1,
+                            help="Nombre de calendriers essayés, le meilleur est gardé (défaut : 1).")
+    gen_parser.add_argument("--formats", default=",".join(EXPORT_FORMATS),
+                            help=f"Formats exportés, séparés par des virgules (défaut : {','.join(EXPORT_FORMATS)}).")
+    gen_parser.add_argument("--pdf-mode", choices=PDF_MODES, default=PDF_MODES[0])
+    gen_parser.add_argument("--workers", type=int, default=None,
+                            help="Processus de rendu PDF/PNG (défaut : tous les cœurs).")
+    gen_parser.add_argument("--timings", action="store_true",
+                            help="Affiche la durée des phases (toujours enregistrée dans timings.json).")
+    gen_parser.add_argument("--profile", action="store_true",
+                            help="Enregistre un profil cProfile dans profile.pstats.")
+    gen_parser.add_argument("--intra-group-from-day", type=int, default=1, metavar="N",
+                            help="Pas de match entre coachs d'un même groupe avant la journée N (défaut : 1).")
+    gen_parser.add_argument("--forbid", action="append", default=[], metavar="A-B",
+                            help="Paire de numéros de coachs qui ne doivent jamais se rencontrer (répétable).")
+    gen_parser.add_argument("--spread-mirror", action="store_true",
+                            help=f"Espace d'au moins {MIRROR_GAP} journées les matchs miroirs d'un même coach.")
+    gen_parser.add_argument("--avoid-race-streak", action="store_true",
+                            help="Évite d'affronter le même roster deux journées de suite.")
+    gen_parser.add_argument("--out", default=".",
+                            help="Dossier racine des sorties. Avec plusieurs ligues, un sous-dossier par ligue.")
+    return parser
+
+
+def parse_forbidden_pairs(values: List[str]) -> List[Tuple[int, int]]:
+    """Paires "A-B" (ou "A,B") de numéros de coachs."""
+    pairs = []
+    for value in values:
+        parts = re.split(r"[-,;\s]+", value.strip())
+        if len(parts) != 2 or not all(part.isdigit() for part in parts):
+            raise ValueError(f"Paire interdite invalide : '{value}' (attendu : A-B).")
+        pairs.append((int(parts[0]), int(parts[1])))
+    return pairs
+
+
+def constraint_options(intra_group_from_day: int = 1, forbidden_pairs=(), spread_mirror: bool = False,
+                       avoid_race_streak: bool = False) -> Optional[Dict[str, Any]]:
+    """Options de ScheduleConstraints pour run_generation_pipeline, ou None si aucune n'est active."""
+    options = {"intra_group_from_day": intra_group_from_day, "forbidden_pairs": list(forbidden_pairs),
+               "spread_mirror": spread_mirror, "avoid_race_streak": avoid_race_streak}
+    return options if ScheduleConstraints(**options) else None
+
+
+def load_leagues(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Liste des ligues à générer : options --coachs, complétées par --config."""
+    defaults = {"days": args.days, "seed": args.seed, "strategy": args.strategy,
+                "candidates": args.candidates, "legs": args.legs, "return_legs": args.return_legs,
+                "constraints": constraint_options(args.intra_group_from_day, parse_forbidden_pairs(args.forbid),
+                                                  args.spread_mirror, args.avoid_race_streak)}
+    leagues = [dict(defaults, coachs=path) for path in args.coachs]
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            leagues.extend(dict(defaults, **entry) for entry in json.load(f))
+    def base_name(league: Dict[str, Any]) -> str:
+        return os.path.splitext(os.path.basename(league["coachs"]))[0]
+
+    sources: Dict[str, Set[str]] = {}
+    for league in leagues:
+        sources.setdefault(base_name(league), set()).add(os.path.abspath(league["coachs"]))
+    for league in leagues:
+        if "out" not in league:
+            name = base_name(league)
+            if len(sources[name]) > 1:
+                # Même nom de fichier dans plusieurs dossiers : le dossier parent les distingue
+                parent = os.path.basename(os.path.dirname(os.path.abspath(league["coachs"])))
+                name = f"{parent}_{name}"
+            league["out"] = args.out if len(leagues) == 1 else os.path.join(args.out, name)
+    outputs: Dict[str, str] = {}
+    for league in leagues:
+        out = os.path.abspath(league["out"])
+        if out in outputs:
+            raise ValueError(f"Les ligues '{outputs[out]}' et '{league['coachs']}' seraient générées dans "
+                             f"le même dossier '{league['out']}' : précisez \"out\" dans --config.")
+        outputs[out] = league["coachs"]
+    return leagues
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée en ligne de commande. Retourne le code de sortie."""
+    args = build_arg_parser().parse_args(argv)
+    formats = {f.strip() for f in args.formats.split(",") if f.strip()}
+    unknown = formats - set(EXPORT_FORMATS)
+    if unknown:
+        print(f"Format(s) inconnu(s) : {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    try:
+        leagues = load_leagues(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if not leagues:
+        print("Aucune ligue à générer : utilisez --coachs ou --config.", file=sys.stderr)
+        return 2
+
+    failures = 0
+    for league in leagues:
+        try:
+            ensure_dir(league["out"])
+            result = run_generation_pipeline(
+                league["coachs"], int(league["days"]), strategy=league["strategy"],
+                seed=league["seed"], n_candidates=int(league["candidates"]),
+                render_workers=args.workers, pdf_mode=args.pdf_mode, formats=formats,
+                output_root=league["out"], profile=args.profile, constraints=league["constraints"],
+                legs=int(league["legs"]), return_legs=league["return_legs"])
+        except Exception as e:
+            failures += 1
+            print(f"[{league['coachs']}] Échec : {e}", file=sys.stderr)
+            continue
+        status = "déjà généré" if result.reused else "généré"
+        print(f"[{league['coachs']}] Calendrier {status} dans '{result.outdir}' "
+              f"(seed {result.generator.seed}, empreinte {result.generator.fingerprint()[:12]})")
+        if result.generator.constraints:
+            violations = result.generator.constraints.violations(result.generator.schedule)
+            print("  Contraintes non respectées : "
+                  + (", ".join(f"{name} {count}" for name, count in violations.items() if count) or "aucune"))
+        for path, message in result.errors:
+            print(f"  Erreur de rendu {path} : {message}", file=sys.stderr)
+        if args.timings and not result.reused:
+            print("  " + result.timings.summary().replace("\n", "\n  "))
+    return 1 if failures else 0
+
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        sys.exit(main_cli())
     main_ui()
\ No newline at end of file